@@ -5,44 +5,96 @@ claude-analyzer — Claude Code Session Analyzer
 Analyze Claude Code session logs and identify inefficiencies.
 """
 
+import os
 import sys
+import mmap
+import heapq
+import operator
 import argparse
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-from collections import defaultdict, Counter
+from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import datetime
 
+try:
+    # orjson is optional; it parses large sessions several times faster
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 class ClaudeSessionAnalyzer:
     """Analyze Claude Code session logs."""
 
+    SENSITIVE_FILES = ('.env', '.env.local', 'secrets.json', 'config/secrets.yml')
+    _SENSITIVE_RE = re.compile('|'.join(re.escape(name) for name in SENSITIVE_FILES))
+
+    # Byte patterns for --fast-summary, which counts without parsing JSON
+    _FAST_LINE_RE = re.compile(rb'^[ \t\r]*[^\s]', re.MULTILINE)
+    _FAST_TOOL_RE = re.compile(rb'"name"\s*:\s*"([^"]+)"')
+    _FAST_COMPACTED_RE = re.compile(rb'"context_compacted"\s*:\s*true')
+    _FAST_TOKENS_RE = re.compile(rb'"total_tokens"\s*:\s*(\d+)')
+
     def __init__(self):
         self.session_dir = Path.home() / '.claude'
-        self.turns = []
-        self.file_accesses = defaultdict(int)
+        self.turn_count = 0
+        self.file_accesses = Counter()
         self.tool_usage = Counter()
         self.token_usage = []
         self.context_compactions = 0
+        self.fast_summary = False
 
-    def load_session(self, session_file: Path) -> bool:
+    def load_session(self, session_file: Path, fast: bool = False) -> bool:
         """Load and parse a Claude session file."""
+        if fast:
+            return self.load_session_fast(session_file)
+
         try:
-            with open(session_file, 'r') as f:
-                content = f.read()
+            # Parse as JSONL (one JSON object per line), streaming so only
+            # one turn is held in memory at a time
+            with open(session_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+
+                    # Guard only the decode: a corrupt line is skipped, but
+                    # errors while analyzing a valid turn are not swallowed
+                    try:
+                        turn = json_loads(line)
+                    except ValueError:
+                        continue
+                    self.turn_count += 1
+                    self._analyze_turn(turn)
 
-            # Parse as JSONL (one JSON object per line)
-            for line in content.strip().split('\n'):
-                if not line:
-                    continue
+            return True
 
-                try:
-                    turn = json.loads(line)
-                    self.turns.append(turn)
-                    self._analyze_turn(turn)
-                except json.JSONDecodeError:
-                    continue
+        except Exception as e:
+            print(f"Error loading session: {e}", file=sys.stderr)
+            return False
+
+    def load_session_fast(self, session_file: Path) -> bool:
+        """Count turns, tool calls, compactions and tokens with byte regexes.
+
+        Much faster than parsing every turn, but approximate: any "name" key
+        counts as a tool call, and file accesses are not tracked, so
+        duplicate-read and sensitive-file insights are unavailable.
+        """
+        self.fast_summary = True
+        try:
+            with open(session_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return True
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self.turn_count += sum(1 for _ in self._FAST_LINE_RE.finditer(mm))
+                    self.tool_usage.update(
+                        name.decode('utf-8', errors='replace')
+                        for name in self._FAST_TOOL_RE.findall(mm)
+                    )
+                    self.context_compactions += len(self._FAST_COMPACTED_RE.findall(mm))
+                    self.token_usage.extend(int(n) for n in self._FAST_TOKENS_RE.findall(mm))
 
             return True
 
@@ -81,16 +133,19 @@ class ClaudeSessionAnalyzer:
         insights = []
 
         # Duplicate file reads
-        duplicate_reads = {k: v for k, v in self.file_accesses.items() if v > 1}
-        if duplicate_reads:
-            top_duplicates = sorted(duplicate_reads.items(), key=lambda x: x[1], reverse=True)[:5]
-            for file_path, count in top_duplicates:
-                insights.append(f"⚠️  File read {count} times: {file_path}")
+        top_duplicates = heapq.nlargest(
+            5,
+            ((k, v) for k, v in self.file_accesses.items() if v > 1),
+            key=operator.itemgetter(1),
+        )
+        for file_path, count in top_duplicates:
+            insights.append(f"⚠️  File read {count} times: {file_path}")
 
         # Sensitive file reads
-        sensitive_files = ['.env', '.env.local', 'secrets.json', 'config/secrets.yml']
-        for sensitive_file in sensitive_files:
-            if any(sensitive_file in f for f in self.file_accesses.keys()):
+        # One regex pass over all paths; only the few hits are checked per name
+        hits = [f for f in self.file_accesses if self._SENSITIVE_RE.search(f)]
+        for sensitive_file in self.SENSITIVE_FILES:
+            if any(sensitive_file in f for f in hits):
                 insights.append(f"🔒 Sensitive file accessed: {sensitive_file}")
 
         # Excessive context compactions
@@ -105,13 +160,13 @@ class ClaudeSessionAnalyzer:
 
         return insights
 
-    def get_file_access_patterns(self) -> List[Tuple[str, int]]:
-        """Get file access patterns."""
-        return sorted(self.file_accesses.items(), key=lambda x: x[1], reverse=True)
+    def get_file_access_patterns(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Get file access patterns, most accessed first (top `limit` if given)."""
+        return self.file_accesses.most_common(limit)
 
-    def get_tool_usage(self) -> List[Tuple[str, int]]:
-        """Get tool usage statistics."""
-        return self.tool_usage.most_common()
+    def get_tool_usage(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Get tool usage statistics, most used first (top `limit` if given)."""
+        return self.tool_usage.most_common(limit)
 
     def get_token_stats(self) -> Dict:
         """Get token usage statistics."""
@@ -129,7 +184,7 @@ class ClaudeSessionAnalyzer:
     def generate_summary(self) -> Dict:
         """Generate session summary."""
         return {
-            'turn_count': len(self.turns),
+            'turn_count': self.turn_count,
             'tool_usage_count': sum(self.tool_usage.values()),
             'unique_files': len(self.file_accesses),
             'context_compactions': self.context_compactions,
@@ -149,7 +204,10 @@ class ClaudeSessionAnalyzer:
         print(f"\n📋 Session Summary:")
         print(f"  Turns: {summary['turn_count']}")
         print(f"  Tool calls: {summary['tool_usage_count']}")
-        print(f"  Unique files: {summary['unique_files']}")
+        if self.fast_summary:
+            print(f"  Unique files: n/a (--fast-summary)")
+        else:
+            print(f"  Unique files: {summary['unique_files']}")
         print(f"  Context compactions: {summary['context_compactions']}")
 
         if summary['token_stats']:
@@ -166,45 +224,97 @@ class ClaudeSessionAnalyzer:
         # File access patterns
         if detailed:
             print(f"\n📁 File Access Patterns:")
-            file_patterns = self.get_file_access_patterns()[:10]
+            file_patterns = self.get_file_access_patterns(10)
             for file_path, count in file_patterns:
                 print(f"  {count:3d}x  {file_path}")
 
         # Tool usage
         if detailed:
             print(f"\n🔧 Tool Usage:")
-            tool_usage = self.get_tool_usage()[:10]
+            tool_usage = self.get_tool_usage(10)
             for tool_name, count in tool_usage:
                 print(f"  {count:3d}x  {tool_name}")
 
         print(f"\n{'=' * 70}\n")
 
-    def load_latest_session(self) -> bool:
+    def load_latest_session(self, fast: bool = False) -> bool:
         """Load the latest session file."""
         if not self.session_dir.exists():
             print(f"Error: Session directory not found: {self.session_dir}", file=sys.stderr)
             return False
 
-        # Find session files
-        session_files = list(self.session_dir.glob('*.jsonl'))
-
-        if not session_files:
+        # Single directory pass keeping the newest file; DirEntry caches stat
+        latest_session = None
+        latest_mtime = -1.0
+        try:
+            with os.scandir(self.session_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.jsonl') and entry.is_file():
+                        mtime = entry.stat().st_mtime
+                        if mtime > latest_mtime:
+                            latest_mtime, latest_session = mtime, Path(entry.path)
+        except OSError:
+            # Not a directory, unreadable, or a file vanished mid-listing
+            latest_session = None
+
+        if latest_session is None:
             print(f"Error: No session files found in {self.session_dir}", file=sys.stderr)
             return False
 
-        # Sort by modification time
-        latest_session = max(session_files, key=lambda p: p.stat().st_mtime)
-
         print(f"Loading session: {latest_session.name}")
-        return self.load_session(latest_session)
+        return self.load_session(latest_session, fast)
+
+    def merge(self, other: 'ClaudeSessionAnalyzer'):
+        """Add another analyzer's counts into this one."""
+        self.turn_count += other.turn_count
+        self.file_accesses += other.file_accesses
+        self.tool_usage += other.tool_usage
+        self.token_usage.extend(other.token_usage)
+        self.context_compactions += other.context_compactions
+        self.fast_summary = self.fast_summary or other.fast_summary
+
+    def analyze_all(self, sessions: List[Path], fast: bool = False) -> bool:
+        """Analyze several sessions in parallel and merge their counts."""
+        if not sessions:
+            return False
+
+        workers = min(os.cpu_count() or 1, len(sessions))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_analyze_one, sessions, [fast] * len(sessions))
+            for result in results:
+                if result is not None:
+                    self.merge(result)
+
+        return True
+
+    def list_sessions(self, limit: Optional[int] = None) -> List[Path]:
+        """List available session files, newest first."""
+        return [Path(path) for _, path in recent_sessions(self.session_dir, limit)]
 
-    def list_sessions(self) -> List[Path]:
-        """List available session files."""
-        if not self.session_dir.exists():
-            return []
 
-        session_files = list(self.session_dir.glob('*.jsonl'))
-        return sorted(session_files, key=lambda p: p.stat().st_mtime, reverse=True)
+def recent_sessions(session_dir: Path, limit: Optional[int] = None) -> List[Tuple[float, str]]:
+    """(mtime, path) of the session files in session_dir, newest first.
+
+    Only the directory is read; with a limit, just the newest entries are kept.
+    """
+    try:
+        with os.scandir(session_dir) as it:
+            entries = ((e.stat().st_mtime, e.path) for e in it
+                       if e.name.endswith('.jsonl') and e.is_file())
+            if limit is None:
+                return sorted(entries, key=operator.itemgetter(0), reverse=True)
+            return heapq.nlargest(limit, entries, key=operator.itemgetter(0))
+    except OSError:
+        # Missing or not a directory: no sessions, as glob() used to report
+        return []
+
+
+def _analyze_one(session_file: Path, fast: bool = False):
+    """Analyze a single session in a worker process."""
+    analyzer = ClaudeSessionAnalyzer()
+    if not analyzer.load_session(session_file, fast):
+        return None
+    return analyzer
 
 
 def main():
@@ -219,30 +329,50 @@ def main():
                       help='Show detailed analysis')
     parser.add_argument('--session-dir', default=None,
                       help='Override session directory (default: ~/.claude)')
+    parser.add_argument('--fast-summary', action='store_true',
+                      help='Approximate counts without parsing JSON (ignored with --detailed)')
+    parser.add_argument('--last', type=int, metavar='N',
+                      help='Analyze the N most recent sessions together (in parallel)')
 
     args = parser.parse_args()
 
+    # The detailed report needs per-file data, which only the full parse has
+    fast = args.fast_summary and not args.detailed
+
     analyzer = ClaudeSessionAnalyzer()
 
     # Override session directory
     if args.session_dir:
         analyzer.session_dir = Path(args.session_dir)
 
-    # List sessions
+    # List sessions (directory metadata only, nothing is parsed)
     if args.list:
-        sessions = analyzer.list_sessions()
+        sessions = recent_sessions(analyzer.session_dir, 10)
         if not sessions:
             print("No sessions found")
             return 0
 
         print(f"\n📁 Available Sessions:\n")
-        for i, session in enumerate(sessions[:10], 1):
-            mtime = datetime.datetime.fromtimestamp(session.stat().st_mtime)
-            print(f"  {i}. {session.name} ({mtime.strftime('%Y-%m-%d %H:%M')})")
+        for i, (mtime, path) in enumerate(sessions, 1):
+            mtime = datetime.datetime.fromtimestamp(mtime)
+            print(f"  {i}. {os.path.basename(path)} ({mtime.strftime('%Y-%m-%d %H:%M')})")
 
         print()
         return 0
 
+    # Analyze several recent sessions together
+    if args.last:
+        sessions = analyzer.list_sessions(args.last)
+        if not sessions:
+            print(f"Error: No session files found in {analyzer.session_dir}", file=sys.stderr)
+            return 1
+
+        print(f"Analyzing {len(sessions)} sessions")
+        if not analyzer.analyze_all(sessions, fast):
+            return 1
+        analyzer.print_report(args.detailed)
+        return 0
+
     # Load session
     if args.session:
         session_file = Path(args.session)
@@ -250,7 +380,7 @@ def main():
             session_file = analyzer.session_dir / session_file
     else:
         # Load latest session
-        if not analyzer.load_latest_session():
+        if not analyzer.load_latest_session(fast):
             return 1
         analyzer.print_report(args.detailed)
         return 0
@@ -260,7 +390,7 @@ def main():
         print(f"Error: Session file not found: {session_file}", file=sys.stderr)
         return 1
 
-    if not analyzer.load_session(session_file):
+    if not analyzer.load_session(session_file, fast):
         return 1
 
     analyzer.print_report(args.detailed)
@@ -5,128 +5,143 @@ dns — DNS Lookup Tool
 Query DNS records (A, AAAA, MX, NS, TXT, CNAME, SOA).
 """
 
+import os
 import sys
 import argparse
 import socket
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Dict, Any, Tuple
 import subprocess
 
+try:
+    # This file is itself called dns.py; keep its directory off the path so
+    # the import finds dnspython's `dns` package rather than this script
+    _script_dir = os.path.dirname(os.path.abspath(__file__))
+    _saved_path = sys.path[:]
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or '.') != _script_dir]
+    try:
+        import dns.resolver as dns_resolver
+    finally:
+        sys.path[:] = _saved_path
+except ImportError:
+    dns_resolver = None
+
 
 class DNSTool:
     """DNS lookup tool."""
 
     def __init__(self):
-        self.record_types = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA']
+        self._dispatch = {
+            'A': self._resolve_a,
+            'AAAA': self._resolve_aaaa,
+            'MX': partial(self._query, record_type='MX'),
+            'NS': partial(self._query, record_type='NS'),
+            'TXT': partial(self._query, record_type='TXT', strip_quotes=True),
+            'CNAME': partial(self._query, record_type='CNAME', strip_dot=True),
+            'SOA': partial(self._query, record_type='SOA', strip_dot=True),
+        }
+        self.record_types = list(self._dispatch)
+
+        # With dnspython, one resolver (and its answer cache) serves every
+        # query in-process; otherwise each lookup shells out to dig
+        self._resolver = None
+        if dns_resolver is not None:
+            try:
+                self._resolver = dns_resolver.Resolver()
+            except Exception:
+                # No usable resolv.conf; dig will report the problem itself
+                pass
+            else:
+                self._resolver.lifetime = 10.0
+                self._resolver.cache = dns_resolver.Cache()
 
     def resolve(self, domain: str, record_type: str = 'A') -> List[str]:
         """Resolve DNS record."""
-        record_type = record_type.upper()
-
-        if record_type == 'A':
-            return self._resolve_a(domain)
-        elif record_type == 'AAAA':
-            return self._resolve_aaaa(domain)
-        elif record_type == 'MX':
-            return self._resolve_mx(domain)
-        elif record_type == 'NS':
-            return self._resolve_ns(domain)
-        elif record_type == 'TXT':
-            return self._resolve_txt(domain)
-        elif record_type == 'CNAME':
-            return self._resolve_cname(domain)
-        elif record_type == 'SOA':
-            return self._resolve_soa(domain)
-        else:
-            return []
+        resolver = self._dispatch.get(record_type.upper())
+        return resolver(domain) if resolver else []
 
     def _resolve_a(self, domain: str) -> List[str]:
         """Resolve A record."""
-        try:
-            result = socket.getaddrinfo(domain, None)
-            return list({addr[4][0] for addr in result if addr[0] == socket.AF_INET})
-        except Exception:
-            return []
+        return self._resolve_a_and_aaaa(domain)[0]
 
     def _resolve_aaaa(self, domain: str) -> List[str]:
         """Resolve AAAA record."""
-        try:
-            result = socket.getaddrinfo(domain, None)
-            return list({addr[4][0] for addr in result if addr[0] == socket.AF_INET6})
-        except Exception:
-            return []
-
-    def _resolve_mx(self, domain: str) -> List[str]:
-        """Resolve MX record using dig."""
-        try:
-            result = subprocess.run(
-                ['dig', '+short', 'MX', domain],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-        except Exception:
-            return []
-
-    def _resolve_ns(self, domain: str) -> List[str]:
-        """Resolve NS record using dig."""
-        try:
-            result = subprocess.run(
-                ['dig', '+short', 'NS', domain],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-        except Exception:
-            return []
-
-    def _resolve_txt(self, domain: str) -> List[str]:
-        """Resolve TXT record using dig."""
-        try:
-            result = subprocess.run(
-                ['dig', '+short', 'TXT', domain],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return [line.strip().strip('"') for line in result.stdout.strip().split('\n') if line.strip()]
-        except Exception:
-            return []
+        return self._resolve_a_and_aaaa(domain)[1]
 
-    def _resolve_cname(self, domain: str) -> List[str]:
-        """Resolve CNAME record using dig."""
+    def _resolve_a_and_aaaa(self, domain: str) -> Tuple[List[str], List[str]]:
+        """Resolve A and AAAA records with a single getaddrinfo() call."""
         try:
-            result = subprocess.run(
-                ['dig', '+short', 'CNAME', domain],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return [line.strip().rstrip('.') for line in result.stdout.strip().split('\n') if line.strip()]
+            # One entry per address (not per socket type) with SOCK_STREAM
+            result = socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM)
         except Exception:
-            return []
-
-    def _resolve_soa(self, domain: str) -> List[str]:
-        """Resolve SOA record using dig."""
-        try:
-            result = subprocess.run(
-                ['dig', '+short', 'SOA', domain],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return [line.strip().rstrip('.') for line in result.stdout.strip().split('\n') if line.strip()]
-        except Exception:
-            return []
+            return [], []
+        ipv4 = list({addr[4][0] for addr in result if addr[0] == socket.AF_INET})
+        ipv6 = list({addr[4][0] for addr in result if addr[0] == socket.AF_INET6})
+        return ipv4, ipv6
+
+    def _query(self, domain: str, record_type: str,
+               strip_quotes: bool = False, strip_dot: bool = False) -> List[str]:
+        """Resolve MX/NS/TXT/CNAME/SOA records, formatted as `dig +short` prints them."""
+        if self._resolver is not None:
+            try:
+                answer = self._resolver.resolve(domain, record_type)
+            except Exception:
+                return []
+            lines = [rdata.to_text() for rdata in answer]
+        else:
+            try:
+                result = subprocess.run(
+                    ['dig', '+short', record_type, domain],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+            except Exception:
+                return []
+            lines = result.stdout.split('\n')
+
+        records = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if strip_quotes:
+                line = line.strip('"')
+            if strip_dot:
+                line = line.rstrip('.')
+            records.append(line)
+        return records
 
     def resolve_all(self, domain: str) -> Dict[str, List[str]]:
         """Resolve all record types."""
+        return self.resolve_all_many([domain])[domain]
+
+    def resolve_all_many(self, domains: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Resolve all record types for several domains, keyed by domain."""
+        # Each lookup just waits on the network (getaddrinfo, dig and
+        # dnspython all release the GIL), so run every (domain, type) pair
+        # side by side in one pool. getaddrinfo() answers A and AAAA together,
+        # so those two share one lookup per domain.
+        workers = min(32, len(domains) * len(self.record_types))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {}
+            for domain in domains:
+                addresses = executor.submit(self._resolve_a_and_aaaa, domain)
+                others = {
+                    record_type: executor.submit(self.resolve, domain, record_type)
+                    for record_type in self.record_types
+                    if record_type not in ('A', 'AAAA')
+                }
+                futures[domain] = (addresses, others)
+
         results = {}
-        for record_type in self.record_types:
-            records = self.resolve(domain, record_type)
-            if records:
-                results[record_type] = records
+        for domain, (addresses, others) in futures.items():
+            ipv4, ipv6 = addresses.result()
+            found = {'A': ipv4, 'AAAA': ipv6}
+            found.update((record_type, future.result()) for record_type, future in others.items())
+            results[domain] = {record_type: found[record_type]
+                               for record_type in self.record_types if found[record_type]}
         return results
 
     def reverse_lookup(self, ip: str) -> Optional[str]:
@@ -188,12 +203,13 @@ def main():
 
     # Query all record types
     if args.all:
+        all_results = tool.resolve_all_many(args.domain)
         for domain in args.domain:
             print(f"\n{'=' * 60}")
             print(f"Domain: {domain}")
             print('=' * 60)
 
-            results = tool.resolve_all(domain)
+            results = all_results[domain]
 
             if results:
                 for record_type in ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA']:
@@ -206,9 +222,11 @@ def main():
 
         return 0
 
-    # Query specific record type
-    for domain in args.domain:
-        records = tool.resolve(domain, args.type)
+    # Query specific record type (all domains at once, printed in order)
+    with ThreadPoolExecutor(max_workers=min(32, len(args.domain))) as executor:
+        all_records = list(executor.map(lambda d: tool.resolve(d, args.type), args.domain))
+
+    for domain, records in zip(args.domain, all_records):
 
         if records:
             for record in records:
@@ -16,6 +16,7 @@ import os
 import sys
 import json
 import shutil
+import hashlib
 import subprocess
 import argparse
 from pathlib import Path
@@ -26,6 +27,7 @@ from typing import List, Dict
 BACKUP_DIR = Path.home() / '.backup'
 BACKUP_INDEX = BACKUP_DIR / 'index.json'
 BACKUP_LOG = BACKUP_DIR / 'backup.log'
+CONTENT_CACHE = BACKUP_DIR / 'content-cache'
 
 
 class Colors:
@@ -38,14 +40,110 @@ class Colors:
     RESET = '\033[0m'
 
 
+_section_buffer = None
+
+
 def print_color(color, text):
     """Print colored text."""
-    print(f"{color}{text}{Colors.RESET}")
+    if _section_buffer is not None:
+        _section_buffer.append(f"{color}{text}{Colors.RESET}\n")
+    else:
+        print(f"{color}{text}{Colors.RESET}")
+
+
+class _OutputBuffer:
+    """Collect print_color output for a section and emit it in one write.
+
+    Disabled when stdout is a TTY so interactive runs still see live progress.
+    """
+
+    def __enter__(self):
+        global _section_buffer
+        if not sys.stdout.isatty():
+            _section_buffer = []
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _section_buffer
+        buf, _section_buffer = _section_buffer, None
+        if buf:
+            sys.stdout.write(''.join(buf))
+            sys.stdout.flush()
+        return False
+
+
+def tail_lines(path: Path, count: int, chunk_size: int = 4096) -> List[str]:
+    """Return the last `count` lines of a file without reading all of it."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        while pos > 0 and data.count(b'\n') <= count:
+            chunk = min(chunk_size, pos)
+            pos -= chunk
+            f.seek(pos)
+            data = f.read(chunk) + data
+
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    return lines[-count:]
+
+
+def file_digest(path: Path) -> str:
+    """Hash file content and mode, used as the content-cache key."""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            hasher.update(chunk)
+    hasher.update(oct(path.stat().st_mode).encode())
+    return hasher.hexdigest()
+
+
+def _fastcopy(src: Path, dest: Path):
+    """Copy a file into a backup, hardlinking identical content already stored."""
+    if not src.is_file():
+        shutil.copy2(src, dest)
+        return
+
+    cached = CONTENT_CACHE / file_digest(src)
+    if dest.exists():
+        dest.unlink()
+
+    if cached.exists():
+        try:
+            os.link(cached, dest)
+            return
+        except OSError:
+            pass  # Filesystem without hardlinks, fall back to a real copy
+
+    shutil.copy2(src, dest)
+    try:
+        CONTENT_CACHE.mkdir(exist_ok=True)
+        os.link(dest, cached)
+    except OSError:
+        pass
+
+
+def gc_content_cache() -> int:
+    """Remove cache entries no longer referenced by any backup."""
+    if not CONTENT_CACHE.exists():
+        return 0
+
+    removed = 0
+    for entry in CONTENT_CACHE.iterdir():
+        if entry.is_file() and entry.stat().st_nlink == 1:
+            entry.unlink()
+            removed += 1
+    return removed
 
 
 def init_backup_system():
     """Initialize backup system."""
-    BACKUP_DIR.mkdir(exist_ok=True)
+    # Index and log only exist once the directory does, so two stats cover
+    # the common already-initialized case
+    if BACKUP_INDEX.is_file() and BACKUP_LOG.is_file():
+        return
+
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 
     if not BACKUP_INDEX.exists():
         with open(BACKUP_INDEX, 'w') as f:
@@ -68,92 +166,95 @@ def create_backup(name: str) -> bool:
     errors = []
 
     # Backup SSH keys
-    ssh_dir = Path.home() / '.ssh'
-    if ssh_dir.exists():
-        print_color(Colors.CYAN, "\n🔐 Backing up SSH keys...")
-        try:
-            ssh_backup = backup_path / 'ssh'
-            ssh_backup.mkdir(exist_ok=True)
+    with _OutputBuffer():
+        ssh_dir = Path.home() / '.ssh'
+        if ssh_dir.exists():
+            print_color(Colors.CYAN, "\n🔐 Backing up SSH keys...")
+            try:
+                ssh_backup = backup_path / 'ssh'
+                ssh_backup.mkdir(exist_ok=True)
 
-            for item in ssh_dir.iterdir():
-                if not item.name.startswith('.'):
-                    dest = ssh_backup / item.name
-                    shutil.copy2(item, dest)
-                    files_backed.append(str(item.relative_to(Path.home())))
-                    print_color(Colors.GREEN, f"  ✓ {item.name}")
+                for item in ssh_dir.iterdir():
+                    if not item.name.startswith('.'):
+                        dest = ssh_backup / item.name
+                        _fastcopy(item, dest)
+                        files_backed.append(str(item.relative_to(Path.home())))
+                        print_color(Colors.GREEN, f"  ✓ {item.name}")
 
-        except Exception as e:
-            errors.append(f"SSH keys: {e}")
-            print_color(Colors.RED, f"  ✗ Failed: {e}")
-    else:
-        print_color(Colors.YELLOW, "⚠  No SSH directory found")
+            except Exception as e:
+                errors.append(f"SSH keys: {e}")
+                print_color(Colors.RED, f"  ✗ Failed: {e}")
+        else:
+            print_color(Colors.YELLOW, "⚠  No SSH directory found")
 
     # Backup workspace configs
-    workspace = Path.home() / '.openclaw' / 'workspace'
-    if workspace.exists():
-        print_color(Colors.CYAN, "\n📝 Backing up workspace configs...")
-
-        configs_to_backup = [
-            'MEMORY.md',
-            'USER.md',
-            'IDENTITY.md',
-            'HEARTBEAT.md',
-        ]
-
-        config_backup = backup_path / 'workspace'
-        config_backup.mkdir(exist_ok=True)
-
-        for config in configs_to_backup:
-            source = workspace / config
-            if source.exists():
-                try:
-                    dest = config_backup / config
-                    shutil.copy2(source, dest)
-                    files_backed.append(f'.openclaw/workspace/{config}')
-                    print_color(Colors.GREEN, f"  ✓ {config}")
-                except Exception as e:
-                    errors.append(f"{config}: {e}")
-                    print_color(Colors.RED, f"  ✗ Failed to backup {config}: {e}")
+    with _OutputBuffer():
+        workspace = Path.home() / '.openclaw' / 'workspace'
+        if workspace.exists():
+            print_color(Colors.CYAN, "\n📝 Backing up workspace configs...")
+
+            configs_to_backup = [
+                'MEMORY.md',
+                'USER.md',
+                'IDENTITY.md',
+                'HEARTBEAT.md',
+            ]
+
+            config_backup = backup_path / 'workspace'
+            config_backup.mkdir(exist_ok=True)
+
+            for config in configs_to_backup:
+                source = workspace / config
+                if source.exists():
+                    try:
+                        dest = config_backup / config
+                        _fastcopy(source, dest)
+                        files_backed.append(f'.openclaw/workspace/{config}')
+                        print_color(Colors.GREEN, f"  ✓ {config}")
+                    except Exception as e:
+                        errors.append(f"{config}: {e}")
+                        print_color(Colors.RED, f"  ✗ Failed to backup {config}: {e}")
 
     # Backup tool configurations
-    tools_dir = workspace / 'tools'
-    if tools_dir.exists():
-        print_color(Colors.CYAN, "\n🔧 Backing up tool configurations...")
+    with _OutputBuffer():
+        tools_dir = workspace / 'tools'
+        if tools_dir.exists():
+            print_color(Colors.CYAN, "\n🔧 Backing up tool configurations...")
 
-        tool_backup = backup_path / 'tools'
-        tool_backup.mkdir(exist_ok=True)
+            tool_backup = backup_path / 'tools'
+            tool_backup.mkdir(exist_ok=True)
 
-        # Backup tick tasks
-        tick_data = Path.home() / '.tick' / 'tasks.json'
-        if tick_data.exists():
-            try:
-                shutil.copy2(tick_data, tool_backup / 'tasks.json')
-                files_backed.append('.tick/tasks.json')
-                print_color(Colors.GREEN, "  ✓ tick tasks.json")
-            except Exception as e:
-                errors.append(f"tick tasks: {e}")
+            # Backup tick tasks
+            tick_data = Path.home() / '.tick' / 'tasks.json'
+            if tick_data.exists():
+                try:
+                    _fastcopy(tick_data, tool_backup / 'tasks.json')
+                    files_backed.append('.tick/tasks.json')
+                    print_color(Colors.GREEN, "  ✓ tick tasks.json")
+                except Exception as e:
+                    errors.append(f"tick tasks: {e}")
 
-        # Backup squad status
-        squad_status = Path.home() / '.squad' / 'status.json'
-        if squad_status.exists():
-            try:
-                squad_backup_dir = tool_backup / 'squad'
-                squad_backup_dir.mkdir(exist_ok=True)
-                shutil.copy2(squad_status, squad_backup_dir / 'status.json')
-                files_backed.append('.squad/status.json')
-                print_color(Colors.GREEN, "  ✓ squad status.json")
-            except Exception as e:
-                errors.append(f"squad status: {e}")
+            # Backup squad status
+            squad_status = Path.home() / '.squad' / 'status.json'
+            if squad_status.exists():
+                try:
+                    squad_backup_dir = tool_backup / 'squad'
+                    squad_backup_dir.mkdir(exist_ok=True)
+                    _fastcopy(squad_status, squad_backup_dir / 'status.json')
+                    files_backed.append('.squad/status.json')
+                    print_color(Colors.GREEN, "  ✓ squad status.json")
+                except Exception as e:
+                    errors.append(f"squad status: {e}")
 
-        # Backup snip snippets
-        snip_data = Path.home() / '.snip' / 'snippets.json'
-        if snip_data.exists():
-            try:
-                shutil.copy2(snip_data, tool_backup / 'snippets.json')
-                files_backed.append('.snip/snippets.json')
-                print_color(Colors.GREEN, "  ✓ snip snippets.json")
-            except Exception as e:
-                errors.append(f"snip data: {e}")
+            # Backup snip snippets
+            snip_data = Path.home() / '.snip' / 'snippets.json'
+            if snip_data.exists():
+                try:
+                    _fastcopy(snip_data, tool_backup / 'snippets.json')
+                    files_backed.append('.snip/snippets.json')
+                    print_color(Colors.GREEN, "  ✓ snip snippets.json")
+                except Exception as e:
+                    errors.append(f"snip data: {e}")
 
     # Create backup metadata
     metadata = {
@@ -171,8 +272,8 @@ def create_backup(name: str) -> bool:
     with open(BACKUP_INDEX) as f:
         backups = json.load(f)
 
-    backups.append(metadata)
-    backups.sort(key=lambda x: x['timestamp'], reverse=True)
+    # Index is kept newest-first and the new backup is always the newest
+    backups.insert(0, metadata)
 
     with open(BACKUP_INDEX, 'w') as f:
         json.dump(backups, f, indent=2)
@@ -262,68 +363,71 @@ def restore_backup(name: str) -> bool:
     print(f"Files to restore: {len(backup_info['files_backed'])}")
 
     # Restore SSH keys
-    ssh_backup = backup_path / 'ssh'
-    if ssh_backup.exists():
-        print_color(Colors.CYAN, "\n🔐 Restoring SSH keys...")
-        ssh_dir = Path.home() / '.ssh'
-        ssh_dir.mkdir(exist_ok=True)
+    with _OutputBuffer():
+        ssh_backup = backup_path / 'ssh'
+        if ssh_backup.exists():
+            print_color(Colors.CYAN, "\n🔐 Restoring SSH keys...")
+            ssh_dir = Path.home() / '.ssh'
+            ssh_dir.mkdir(exist_ok=True)
+
+            for item in ssh_backup.iterdir():
+                dest = ssh_dir / item.name
+                try:
+                    if item.is_file():
+                        shutil.copy2(item, dest)
+                        print_color(Colors.GREEN, f"  ✓ {item.name}")
+                    else:
+                        if dest.exists():
+                            shutil.rmtree(dest)
+                        shutil.copytree(item, dest)
+                        print_color(Colors.GREEN, f"  ✓ {item.name}/")
+                except Exception as e:
+                    print_color(Colors.RED, f"  ✗ {item.name}: {e}")
 
-        for item in ssh_backup.iterdir():
-            dest = ssh_dir / item.name
-            try:
-                if item.is_file():
+    # Restore workspace configs
+    with _OutputBuffer():
+        workspace_backup = backup_path / 'workspace'
+        if workspace_backup.exists():
+            print_color(Colors.CYAN, "\n📝 Restoring workspace configs...")
+            workspace = Path.home() / '.openclaw' / 'workspace'
+
+            for item in workspace_backup.iterdir():
+                dest = workspace / item.name
+                try:
                     shutil.copy2(item, dest)
                     print_color(Colors.GREEN, f"  ✓ {item.name}")
-                else:
-                    if dest.exists():
-                        shutil.rmtree(dest)
-                    shutil.copytree(item, dest)
-                    print_color(Colors.GREEN, f"  ✓ {item.name}/")
-            except Exception as e:
-                print_color(Colors.RED, f"  ✗ {item.name}: {e}")
+                except Exception as e:
+                    print_color(Colors.RED, f"  ✗ {item.name}: {e}")
 
-    # Restore workspace configs
-    workspace_backup = backup_path / 'workspace'
-    if workspace_backup.exists():
-        print_color(Colors.CYAN, "\n📝 Restoring workspace configs...")
-        workspace = Path.home() / '.openclaw' / 'workspace'
+    # Restore tool configs
+    with _OutputBuffer():
+        tools_backup = backup_path / 'tools'
+        if tools_backup.exists():
+            print_color(Colors.CYAN, "\n🔧 Restoring tool configurations...")
+
+            # Restore tick tasks
+            tick_backup = tools_backup / 'tasks.json'
+            if tick_backup.exists():
+                tick_dir = Path.home() / '.tick'
+                tick_dir.mkdir(exist_ok=True)
+                shutil.copy2(tick_backup, tick_dir / 'tasks.json')
+                print_color(Colors.GREEN, "  ✓ tick tasks.json")
 
-        for item in workspace_backup.iterdir():
-            dest = workspace / item.name
-            try:
-                shutil.copy2(item, dest)
-                print_color(Colors.GREEN, f"  ✓ {item.name}")
-            except Exception as e:
-                print_color(Colors.RED, f"  ✗ {item.name}: {e}")
+            # Restore snip snippets
+            snip_backup = tools_backup / 'snippets.json'
+            if snip_backup.exists():
+                snip_dir = Path.home() / '.snip'
+                snip_dir.mkdir(exist_ok=True)
+                shutil.copy2(snip_backup, snip_dir / 'snippets.json')
+                print_color(Colors.GREEN, "  ✓ snip snippets.json")
 
-    # Restore tool configs
-    tools_backup = backup_path / 'tools'
-    if tools_backup.exists():
-        print_color(Colors.CYAN, "\n🔧 Restoring tool configurations...")
-
-        # Restore tick tasks
-        tick_backup = tools_backup / 'tasks.json'
-        if tick_backup.exists():
-            tick_dir = Path.home() / '.tick'
-            tick_dir.mkdir(exist_ok=True)
-            shutil.copy2(tick_backup, tick_dir / 'tasks.json')
-            print_color(Colors.GREEN, "  ✓ tick tasks.json")
-
-        # Restore snip snippets
-        snip_backup = tools_backup / 'snippets.json'
-        if snip_backup.exists():
-            snip_dir = Path.home() / '.snip'
-            snip_dir.mkdir(exist_ok=True)
-            shutil.copy2(snip_backup, snip_dir / 'snippets.json')
-            print_color(Colors.GREEN, "  ✓ snip snippets.json")
-
-        # Restore squad status
-        squad_backup = tools_backup / 'squad' / 'status.json'
-        if squad_backup.exists():
-            squad_dir = Path.home() / '.squad'
-            squad_dir.mkdir(exist_ok=True)
-            shutil.copy2(squad_backup, squad_dir / 'status.json')
-            print_color(Colors.GREEN, "  ✓ squad status.json")
+            # Restore squad status
+            squad_backup = tools_backup / 'squad' / 'status.json'
+            if squad_backup.exists():
+                squad_dir = Path.home() / '.squad'
+                squad_dir.mkdir(exist_ok=True)
+                shutil.copy2(squad_backup, squad_dir / 'status.json')
+                print_color(Colors.GREEN, "  ✓ squad status.json")
 
     # Log restore
     timestamp = datetime.now().isoformat()
@@ -346,7 +450,13 @@ def show_status():
     # Backup directory
     if BACKUP_DIR.exists():
         print_color(Colors.GREEN, f"\n✓ Backup directory: {BACKUP_DIR}")
-        total_size = sum(f.stat().st_size for f in BACKUP_DIR.rglob('*') if f.is_file())
+        # Hardlinked files share one inode, count them once
+        inodes = {}
+        for f in BACKUP_DIR.rglob('*'):
+            if f.is_file():
+                st = f.stat()
+                inodes[(st.st_dev, st.st_ino)] = st.st_size
+        total_size = sum(inodes.values())
         print(f"  Total size: {total_size / 1024 / 1024:.2f} MB")
     else:
         print_color(Colors.YELLOW, "\n⚠ Backup directory not found")
@@ -363,8 +473,7 @@ def show_status():
     # Recent activity
     if BACKUP_LOG.exists():
         print_color(Colors.CYAN, "\n📜 Recent Activity:")
-        with open(BACKUP_LOG) as f:
-            lines = f.readlines()[-5:]  # Last 5 entries
+        lines = tail_lines(BACKUP_LOG, 5)  # Last 5 entries
         for line in lines:
             print(f"  {line.strip()}")
     else:
@@ -416,6 +525,10 @@ def cleanup_old_backups(keep_count: int = 10):
         except Exception as e:
             print_color(Colors.RED, f"  ✗ Failed to remove {backup_info['name']}: {e}")
 
+    orphans = gc_content_cache()
+    if orphans:
+        print_color(Colors.GREEN, f"  ✓ Pruned {orphans} unreferenced cached files")
+
     # Update index
     backups = backups[:keep_count]
     with open(BACKUP_INDEX, 'w') as f:
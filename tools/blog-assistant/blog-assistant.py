@@ -23,7 +23,9 @@ import os
 import re
 import sys
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
+from string import Template
 
 
 def find_learnings(agent_name):
@@ -58,43 +60,49 @@ def find_learnings(agent_name):
     return "\n\n---\n\n".join(content)
 
 
-def extract_key_points(notes):
-    """Extract key points from research notes."""
-    key_points = []
+def _unique(items, limit):
+    """Return up to `limit` distinct items, keeping first-seen order."""
+    seen = set()
+    result = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+            if len(result) >= limit:
+                break
+    return result
 
-    # Look for numbered lists
-    numbered_items = re.findall(r'^\s*\d+\.\s+(.+)$', notes, re.MULTILINE)
-    key_points.extend(numbered_items)
 
-    # Look for bullet points
-    bullet_items = re.findall(r'^\s*[\-\*]\s+(.+)$', notes, re.MULTILINE)
-    key_points.extend(bullet_items)
-
-    # Look for sentences with keywords (finding, result, shows, data)
-    keyword_sentences = re.findall(
-        r'.{50,150}(?:finding|result|shows|data|found|demonstrated).{50,150}',
-        notes,
-        re.IGNORECASE
+def extract_key_points(notes):
+    """Extract key points from research notes."""
+    matches = chain(
+        # Look for numbered lists
+        (m.group(1) for m in re.finditer(r'^\s*\d+\.\s+(.+)$', notes, re.MULTILINE)),
+        # Look for bullet points
+        (m.group(1) for m in re.finditer(r'^\s*[\-\*]\s+(.+)$', notes, re.MULTILINE)),
+        # Look for sentences with keywords (finding, result, shows, data)
+        (m.group(0) for m in re.finditer(
+            r'.{50,150}(?:finding|result|shows|data|found|demonstrated).{50,150}',
+            notes,
+            re.IGNORECASE
+        )),
     )
-    key_points.extend(keyword_sentences)
 
     # Clean and deduplicate
-    key_points = [p.strip() for p in key_points if len(p.strip()) > 20]
-    key_points = list(dict.fromkeys(key_points))
-
-    return key_points[:15]  # Return up to 15 key points
+    key_points = (p.strip() for p in matches)
+    return _unique((p for p in key_points if len(p) > 20), 15)  # Up to 15 key points
 
 
 def extract_quotes(notes):
     """Extract quotes from research notes."""
-    quotes = re.findall(r'"([^"]+)"', notes)
-    quotes.extend(re.findall(r'`([^`]+)`', notes))
+    matches = chain(
+        (m.group(1) for m in re.finditer(r'"([^"]+)"', notes)),
+        (m.group(1) for m in re.finditer(r'`([^`]+)`', notes)),
+    )
 
     # Clean and filter
-    quotes = [q.strip() for q in quotes if 20 < len(q) < 200]
-    quotes = list(dict.fromkeys(quotes))
-
-    return quotes[:10]  # Return up to 10 quotes
+    quotes = (q.strip() for q in matches if 20 < len(q) < 200)
+    return _unique(quotes, 10)  # Up to 10 quotes
 
 
 def extract_numbers(notes):
@@ -107,44 +115,20 @@ def extract_numbers(notes):
         r'\b\d+\s*(?:billion|million|thousand)\b',  # Written numbers
     ]
 
-    numbers = []
-    for pattern in patterns:
-        matches = re.findall(pattern, notes, re.IGNORECASE)
-        numbers.extend(matches)
-
-    # Deduplicate
-    numbers = list(dict.fromkeys(numbers))
-
-    return numbers[:10]  # Return up to 10 numbers
-
-
-def generate_outline(topic, notes, agent_source=None):
-    """Generate blog post outline from topic and notes."""
-    key_points = extract_key_points(notes)
-    quotes = extract_quotes(notes)
-    numbers = extract_numbers(notes)
-
-    # Generate title options
-    title_options = [
-        f"How {topic} Is Changing Everything",
-        f"The {topic} Revolution: What You Need to Know",
-        f"Why {topic} Matters Now More Than Ever",
-        f"Inside the {topic} Shift",
-        f"{topic}: The Data-Driven Story",
-    ]
+    numbers = (
+        m.group(0)
+        for pattern in patterns
+        for m in re.finditer(pattern, notes, re.IGNORECASE)
+    )
+    return _unique(numbers, 10)  # Up to 10 numbers
 
-    # Generate hook ideas
-    hook_ideas = [
-        f"Start with a surprising statistic about {topic}",
-        f"Open with a real-world {topic} story",
-        f"Hook with a common misconception about {topic}",
-        f"Begin with the 'before' state of {topic}",
-    ]
 
-    # Build outline
-    outline = f"""# Blog Post Outline: {topic}
+# Outline skeleton, one Template per section. Placeholders are filled from the
+# context dict built in generate_outline() so the text is parsed only once.
+_OUTLINE_TEMPLATE_SECTIONS = [Template(section) for section in (
+    """# Blog Post Outline: $topic
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}
+**Generated:** $generated
 **Word count target:** 1800-2000 words
 **Style:** Run Data Run (narrative, data-driven, conversational)
 
@@ -152,50 +136,44 @@ def generate_outline(topic, notes, agent_source=None):
 
 ## Title Options
 
-"""
-    for i, title in enumerate(title_options, 1):
-        outline += f"{i}. {title}\n"
-
-    outline += f"""
+$title_options
 ## Hook Ideas (Choose One)
 
-"""
-    for i, hook in enumerate(hook_ideas, 1):
-        outline += f"{i}. {hook}\n"
-
-    outline += f"""
+$hook_ideas
 ---
-
+""",
+    """
 ## Section 1: Introduction (200-250 words)
 
 **Goal:** Grab attention, set context, state the main point
 
 ### Opening hook
-{hook_ideas[0]}
+$opening_hook
 
 ### Context setting
-- Briefly introduce {topic}
+- Briefly introduce $topic
 - Why this matters right now
 - What readers will learn
 
 ### Thesis statement
-[Insert 1-2 sentence thesis about {topic}]
+[Insert 1-2 sentence thesis about $topic]
 
-**Suggested data points:** {', '.join(numbers[:3]) if numbers else 'Add relevant statistics'}
+**Suggested data points:** $intro_numbers
 
 ---
-
+""",
+    """
 ## Section 2: The Problem (300-350 words)
 
-**Goal:** Set up the tension, show why {topic} is hard/interesting
+**Goal:** Set up the tension, show why $topic is hard/interesting
 
 ### Current state
-- What's the status quo with {topic}?
+- What's the status quo with $topic?
 - What are the pain points?
 - Who is affected?
 
 ### Specific challenge
-- Pick ONE specific problem related to {topic}
+- Pick ONE specific problem related to $topic
 - Show, don't tell (use data, examples)
 - Make it concrete
 
@@ -204,28 +182,19 @@ def generate_outline(topic, notes, agent_source=None):
 - Why should readers care?
 
 **Key points to include:**
-"""
-
-    for i, point in enumerate(key_points[:3], 1):
-        outline += f"- {point}\n"
-
-    outline += f"""
+$problem_points
 **Suggested quotes:**
-"""
-
-    for quote in quotes[:2]:
-        outline += f'- "{quote}"\n'
-
-    outline += f"""
+$problem_quotes
 
 ---
-
+""",
+    """
 ## Section 3: The Shift / Solution (400-450 words)
 
 **Goal:** Show what's changing, introduce the solution
 
 ### What's different now
-- Recent developments in {topic}
+- Recent developments in $topic
 - New approaches or technologies
 - Key inflection points
 
@@ -240,30 +209,18 @@ def generate_outline(topic, notes, agent_source=None):
 - Who's leading the charge?
 
 **Key insights:**
-"""
-
-    for i, point in enumerate(key_points[3:6], 1):
-        outline += f"- {point}\n"
-
-    outline += f"""
-**Suggested data:** {', '.join(numbers[3:6]) if len(numbers) > 3 else 'Add relevant statistics'}
+$solution_points
+**Suggested data:** $solution_numbers
 
 ---
-
+""",
+    """
 ## Section 4: The Data (350-400 words)
 
 **Goal:** Back up claims with numbers
 
 ### Hard numbers
-"""
-
-    if numbers:
-        for i, num in enumerate(numbers[:5], 1):
-            outline += f"{i}. {num}\n"
-    else:
-        outline += "- [Add 3-5 specific numbers/statistics here]\n"
-
-    outline += f"""
+$hard_numbers
 ### Case studies
 - [Real-world example 1: company/project/person]
 - [Real-world example 2: company/project/person]
@@ -271,11 +228,12 @@ def generate_outline(topic, notes, agent_source=None):
 
 ### Comparisons
 - Before vs after data
-- {topic} vs alternatives
+- $topic vs alternatives
 - Benchmarks and baselines
 
 ---
-
+""",
+    """
 ## Section 5: Practical Implications (300-350 words)
 
 **Goal:** What does this mean for readers?
@@ -296,7 +254,8 @@ def generate_outline(topic, notes, agent_source=None):
 - [Mistake 3 to avoid]
 
 ---
-
+""",
+    """
 ## Section 6: The Future (200-250 words)
 
 **Goal:** Where is this going?
@@ -314,15 +273,11 @@ def generate_outline(topic, notes, agent_source=None):
 - What are we watching?
 
 **Key insights:**
-"""
-
-    for i, point in enumerate(key_points[6:9], 1):
-        outline += f"- {point}\n"
-
-    outline += f"""
+$future_points
 
 ---
-
+""",
+    """
 ## Section 7: Conclusion (150-200 words)
 
 **Goal:** Tie it all together, end strong
@@ -338,7 +293,8 @@ def generate_outline(topic, notes, agent_source=None):
 - [What should readers do next?]
 
 ---
-
+""",
+    """
 ## Style Notes (Run Data Run)
 
 ### Tone
@@ -364,40 +320,27 @@ def generate_outline(topic, notes, agent_source=None):
 - Too much jargon
 
 ---
-
+""",
+    """
 ## Research Notes Summary
 
-**Source:** {agent_source or 'Provided notes'}
-**Key points extracted:** {len(key_points)}
-**Quotes extracted:** {len(quotes)}
-**Numbers/statistics:** {len(numbers)}
+**Source:** $source
+**Key points extracted:** $key_point_count
+**Quotes extracted:** $quote_count
+**Numbers/statistics:** $number_count
 
 ### Top 3 Key Points
-"""
-
-    for i, point in enumerate(key_points[:3], 1):
-        outline += f"{i}. {point}\n"
-
-    outline += f"""
+$top_points
 
 ### Top 2 Quotes
-"""
-    for quote in quotes[:2]:
-        outline += f'- "{quote}"\n'
-
-    outline += f"""
+$top_quotes
 
 ### Available Numbers
-"""
-    if numbers:
-        outline += ', '.join(numbers[:8])
-    else:
-        outline += "[Add numbers from research notes]"
-
-    outline += f"""
+$available_numbers
 
 ---
-
+""",
+    """
 ## Next Steps
 
 1. ✅ Choose a title and hook
@@ -411,9 +354,71 @@ def generate_outline(topic, notes, agent_source=None):
 ---
 
 *Generated by blog-assistant for the OpenSeneca squad*
-"""
+""",
+)]
+
+
+def _numbered(items):
+    """Format items as a numbered markdown list."""
+    return "".join(f"{i}. {item}\n" for i, item in enumerate(items, 1))
+
+
+def _bulleted(items):
+    """Format items as a bulleted markdown list."""
+    return "".join(f"- {item}\n" for item in items)
+
+
+def _quoted(quotes):
+    """Format quotes as a bulleted markdown list."""
+    return "".join(f'- "{quote}"\n' for quote in quotes)
+
+
+def generate_outline(topic, notes, agent_source=None):
+    """Generate blog post outline from topic and notes."""
+    key_points = extract_key_points(notes)
+    quotes = extract_quotes(notes)
+    numbers = extract_numbers(notes)
+
+    # Generate title options
+    title_options = [
+        f"How {topic} Is Changing Everything",
+        f"The {topic} Revolution: What You Need to Know",
+        f"Why {topic} Matters Now More Than Ever",
+        f"Inside the {topic} Shift",
+        f"{topic}: The Data-Driven Story",
+    ]
+
+    # Generate hook ideas
+    hook_ideas = [
+        f"Start with a surprising statistic about {topic}",
+        f"Open with a real-world {topic} story",
+        f"Hook with a common misconception about {topic}",
+        f"Begin with the 'before' state of {topic}",
+    ]
 
-    return outline
+    ctx = {
+        'topic': topic,
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M UTC'),
+        'title_options': _numbered(title_options),
+        'hook_ideas': _numbered(hook_ideas),
+        'opening_hook': hook_ideas[0],
+        'intro_numbers': ', '.join(numbers[:3]) if numbers else 'Add relevant statistics',
+        'problem_points': _bulleted(key_points[:3]),
+        'problem_quotes': _quoted(quotes[:2]),
+        'solution_points': _bulleted(key_points[3:6]),
+        'solution_numbers': ', '.join(numbers[3:6]) if len(numbers) > 3 else 'Add relevant statistics',
+        'hard_numbers': _numbered(numbers[:5]) if numbers else "- [Add 3-5 specific numbers/statistics here]\n",
+        'future_points': _bulleted(key_points[6:9]),
+        'source': agent_source or 'Provided notes',
+        'key_point_count': len(key_points),
+        'quote_count': len(quotes),
+        'number_count': len(numbers),
+        'top_points': _numbered(key_points[:3]),
+        'top_quotes': _quoted(quotes[:2]),
+        'available_numbers': ', '.join(numbers[:8]) if numbers else "[Add numbers from research notes]",
+    }
+
+    return "".join(section.substitute(ctx) for section in _OUTLINE_TEMPLATE_SECTIONS)
 
 
 def save_outline(content, topic):
@@ -2,7 +2,7 @@
 """
 AZ Competitor AI Announcement Database
 
-Maintains a JSON database of competitor AI announcements relevant to AstraZeneca.
+Maintains a JSONL database of competitor AI announcements relevant to AstraZeneca.
 Provides add, query, and reporting functionality for tracking competitive intelligence.
 
 Commands:
@@ -10,166 +10,439 @@ Commands:
     competitor-tracker query --company "Roche" --days 30
     competitor-tracker report --days 7
 
-Data stored in: ~/.openclaw/workspace/data/competitors.json
+Data stored in: ~/.openclaw/workspace/data/competitors.jsonl
+(metadata in competitors.meta.json; an old competitors.json is migrated on first use)
 """
 
 import argparse
+import dataclasses
+import functools
 import json
 import os
 import sys
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
+import typing
+from typing import Optional
 
+try:
+    # orjson is optional; it is several times faster on large databases
+    import orjson
+except ImportError:
+    orjson = None
 
-def get_data_path():
-    """Get the path to the competitors JSON database."""
+try:
+    # msgspec is optional; it decodes records straight into typed structs
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Announcement schema, shared by the msgspec and plain-Python record types
+_ANNOUNCEMENT_FIELDS = [
+    ('id', int),
+    ('date_added', str),
+    ('company', str),
+    ('action', str),
+    ('source', str),
+    ('implication', str),
+    ('category', str),
+    ('priority', str),
+    ('status', str, 'active'),
+    # Derived fields, backfilled on load for older records: epoch seconds of
+    # date_added, and lowercased copies of the filterable strings
+    ('date_added_ts', Optional[float], None),
+    ('company_lc', Optional[str], None),
+    ('category_lc', Optional[str], None),
+    ('priority_lc', Optional[str], None),
+]
+
+if msgspec is not None:
+    Announcement = msgspec.defstruct('Announcement', _ANNOUNCEMENT_FIELDS)
+    _decode_announcement = msgspec.json.Decoder(Announcement).decode
+    _announcement_dict = msgspec.structs.asdict
+else:
+    Announcement = dataclasses.make_dataclass('Announcement', _ANNOUNCEMENT_FIELDS, slots=True)
+    _announcement_dict = dataclasses.asdict
+
+_ANNOUNCEMENT_NAMES = frozenset(field[0] for field in _ANNOUNCEMENT_FIELDS)
+
+
+def _accepted_types(annotation):
+    """Value types the JSON decoder may produce for a schema annotation."""
+    types = typing.get_args(annotation) or (annotation,)
+    if float in types:
+        # JSON numbers without a fraction decode as int
+        types += (int,)
+    return tuple(types)
+
+
+# Field name -> accepted value types, used to validate plain-Python records
+_ANNOUNCEMENT_TYPES = {field[0]: _accepted_types(field[1]) for field in _ANNOUNCEMENT_FIELDS}
+
+
+def _loads(data):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj, pretty=False):
+    """Serialize to UTF-8 JSON bytes, compact unless pretty, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _dumps_line(obj):
+    """Serialize to one compact line of UTF-8 JSON, newline included."""
+    return _dumps(obj) + b'\n'
+
+
+def _announcement(record):
+    """Build an Announcement from a parsed dict, ignoring unknown keys."""
+    return Announcement(**{k: v for k, v in record.items() if k in _ANNOUNCEMENT_NAMES})
+
+
+def _parse_announcement(line):
+    """Parse one JSONL line into an Announcement.
+
+    Raises ValueError both for invalid JSON and for records that don't fit
+    the schema, whichever backend is decoding.
+    """
+    if msgspec is not None:
+        try:
+            return _decode_announcement(line)
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            raise ValueError(str(e)) from e
+    try:
+        announcement = _announcement(_loads(line))
+    except (TypeError, AttributeError) as e:
+        # Missing required fields, or a line that isn't a JSON object
+        raise ValueError(str(e)) from e
+
+    # The dataclass doesn't check types; reject what msgspec would reject
+    for name, types in _ANNOUNCEMENT_TYPES.items():
+        value = getattr(announcement, name)
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError(f"Expected {' | '.join(t.__name__ for t in types)} for {name!r}, "
+                             f"got {type(value).__name__}")
+    return announcement
+
+
+def get_data_dir():
+    """Get the data directory, creating it if needed."""
     data_dir = os.path.expanduser('~/.openclaw/workspace/data')
     os.makedirs(data_dir, exist_ok=True)
-    return os.path.join(data_dir, 'competitors.json')
+    return data_dir
 
 
-def load_database():
-    """Load the competitor database from JSON file."""
-    data_path = get_data_path()
-    
-    if os.path.exists(data_path):
+def get_data_path():
+    """Get the path to the competitors JSONL database (one announcement per line)."""
+    return os.path.join(get_data_dir(), 'competitors.jsonl')
+
+
+def get_meta_path():
+    """Get the path to the database metadata sidecar."""
+    return os.path.join(get_data_dir(), 'competitors.meta.json')
+
+
+def _new_metadata():
+    """Metadata for an empty database."""
+    now_iso = datetime.now().isoformat()
+    return {
+        'created': now_iso,
+        'last_updated': now_iso,
+        'version': '1.0',
+        'total_announcements': 0
+    }
+
+
+def _load_metadata():
+    """Load the metadata sidecar, or fresh metadata if it is missing."""
+    try:
+        with open(get_meta_path(), 'rb') as f:
+            return _loads(f.read())
+    except (ValueError, IOError):
+        return _new_metadata()
+
+
+def _save_metadata(metadata):
+    """Write the metadata sidecar."""
+    with open(get_meta_path(), 'wb') as f:
+        f.write(_dumps(metadata))
+
+
+def _with_derived_fields(announcement):
+    """Fill in the derived fields on records that predate them."""
+    if announcement.date_added_ts is None:
+        announcement.date_added_ts = datetime.fromisoformat(announcement.date_added).timestamp()
+    if announcement.company_lc is None:
+        announcement.company_lc = announcement.company.lower()
+        announcement.category_lc = announcement.category.lower()
+        announcement.priority_lc = announcement.priority.lower()
+    return announcement
+
+
+def _migrate_legacy_database():
+    """Convert the old single-file competitors.json into the JSONL store."""
+    legacy_path = os.path.join(get_data_dir(), 'competitors.json')
+    if os.path.exists(get_data_path()) or not os.path.exists(legacy_path):
+        return
+
+    try:
+        with open(legacy_path, 'rb') as f:
+            database = _loads(f.read())
+    except (ValueError, IOError) as e:
+        print(f"Warning: Could not migrate {legacy_path}: {e}", file=sys.stderr)
+        return
+
+    database['announcements'] = [
+        _with_derived_fields(_announcement(a)) for a in database['announcements']
+    ]
+    if save_database(database):
+        print(f"Migrated {legacy_path} to {get_data_path()}", file=sys.stderr)
+
+
+def _index_by_company(announcements):
+    """Map lowercased company name to the row indices of its announcements."""
+    index = defaultdict(list)
+    for i, a in enumerate(announcements):
+        index[a.company_lc].append(i)
+    return dict(index)
+
+
+def _stat_key(path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_cached(data_path, data_key, meta_key):
+    """Parse the JSONL store; cached while both files' stat keys are unchanged."""
+    if data_key is not None:
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            announcements = []
+            with open(data_path, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # A torn or malformed line loses only that record
+                    try:
+                        announcements.append(_with_derived_fields(_parse_announcement(line)))
+                    except ValueError as e:
+                        print(f"Warning: Skipping bad record on line {line_no} of {data_path}: {e}",
+                              file=sys.stderr)
+            
+            metadata = _load_metadata()
+            metadata['total_announcements'] = len(announcements)
+            return {
+                'metadata': metadata,
+                'announcements': announcements,
+                'by_company': _index_by_company(announcements),
+            }
+        except (ValueError, IOError) as e:
             print(f"Warning: Could not load database: {e}", file=sys.stderr)
     
     # Return empty database structure
     return {
-        'metadata': {
-            'created': datetime.now().isoformat(),
-            'last_updated': datetime.now().isoformat(),
-            'version': '1.0',
-            'total_announcements': 0
-        },
-        'announcements': []
+        'metadata': _new_metadata(),
+        'announcements': [],
+        'by_company': {},
     }
 
 
-def save_database(database):
-    """Save the competitor database to JSON file."""
+def load_database():
+    """Load the competitor database from the JSONL store.
+
+    Repeated calls in one process reuse the parsed database until either file
+    changes on disk. Treat the result as read-only.
+    """
+    _migrate_legacy_database()
+    data_path = get_data_path()
+    return _load_cached(data_path, _stat_key(data_path), _stat_key(get_meta_path()))
+
+
+def save_database(database, now_iso=None):
+    """Rewrite the whole competitor database (JSONL store plus metadata).
+
+    Callers that already took a timestamp can pass it as now_iso so that
+    last_updated matches their records.
+    """
     data_path = get_data_path()
     
     # Update metadata
-    database['metadata']['last_updated'] = datetime.now().isoformat()
+    database['metadata']['last_updated'] = now_iso or datetime.now().isoformat()
     database['metadata']['total_announcements'] = len(database['announcements'])
     
     try:
-        with open(data_path, 'w', encoding='utf-8') as f:
-            json.dump(database, f, indent=2, ensure_ascii=False)
+        tmp_path = data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(_dumps_line(_announcement_dict(a)) for a in database['announcements']))
+        os.replace(tmp_path, data_path)
+        _save_metadata(database['metadata'])
         return True
     except IOError as e:
         print(f"Error: Could not save database: {e}", file=sys.stderr)
         return False
 
 
+def _count_announcements():
+    """Count stored announcements without parsing them."""
+    _migrate_legacy_database()
+    try:
+        with open(get_data_path(), 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    except FileNotFoundError:
+        return 0
+
+
 def add_announcement(company, action, source, implication, category=None, priority='medium'):
     """Add a new competitor announcement to the database."""
-    database = load_database()
-    
-    announcement = {
-        'id': len(database['announcements']) + 1,
-        'date_added': datetime.now().isoformat(),
-        'company': company.strip(),
-        'action': action.strip(),
-        'source': source.strip(),
-        'implication': implication.strip(),
-        'category': category or 'general',
-        'priority': priority.lower(),
-        'status': 'active'
-    }
-    
-    database['announcements'].append(announcement)
-    
-    if save_database(database):
-        print(f"✓ Added announcement for {company}: {action}")
-        return True
-    else:
+    # One clock read shared by the record and the metadata
+    now = datetime.now()
+    now_iso = now.isoformat()
+    count = _count_announcements()
+    
+    announcement = _with_derived_fields(Announcement(
+        id=count + 1,
+        date_added=now_iso,
+        date_added_ts=now.timestamp(),
+        company=company.strip(),
+        action=action.strip(),
+        source=source.strip(),
+        implication=implication.strip(),
+        category=category or 'general',
+        priority=priority.lower(),
+    ))
+    
+    # Append-only: a single line is written, existing records are untouched
+    try:
+        with open(get_data_path(), 'a+b') as f:
+            # Terminate a torn last line so the new record starts on its own
+            prefix = b''
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    prefix = b'\n'
+            f.write(prefix + _dumps_line(_announcement_dict(announcement)))
+        
+        metadata = _load_metadata()
+        metadata['last_updated'] = now_iso
+        metadata['total_announcements'] = count + 1
+        _save_metadata(metadata)
+    except IOError as e:
+        print(f"Error: Could not save database: {e}", file=sys.stderr)
         print("✗ Failed to add announcement", file=sys.stderr)
         return False
+    
+    print(f"✓ Added announcement for {company}: {action}")
+    return True
 
 
 def query_announcements(company=None, days=None, category=None, priority=None):
     """Query announcements with optional filters."""
     database = load_database()
-    announcements = database['announcements']
-    
-    # Apply filters
-    if company:
-        announcements = [a for a in announcements if company.lower() in a['company'].lower()]
-    
-    if days:
-        cutoff_date = datetime.now() - timedelta(days=days)
-        announcements = [a for a in announcements 
-                        if datetime.fromisoformat(a['date_added']) >= cutoff_date]
     
-    if category:
-        announcements = [a for a in announcements if category.lower() == a['category'].lower()]
-    
-    if priority:
-        announcements = [a for a in announcements if priority.lower() == a['priority'].lower()]
-    
-    # Sort by date (most recent first)
-    announcements.sort(key=lambda x: x['date_added'], reverse=True)
-    
-    return announcements
+    # Normalize filter values once, then apply all filters in a single pass
+    company_lc = company.lower() if company else None
+    category_lc = category.lower() if category else None
+    priority_lc = priority.lower() if priority else None
+    cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp() if days else None
+    
+    rows = database['announcements']
+    if company_lc is not None:
+        # Substring-match the distinct company names, then visit only their rows
+        by_company = database.get('by_company') or _index_by_company(rows)
+        rows = [rows[i] for i in sorted(
+            i for name, indices in by_company.items() if company_lc in name for i in indices
+        )]
+    
+    announcements = [
+        a for a in rows
+        if (cutoff_ts is None or a.date_added_ts >= cutoff_ts)
+        and (category_lc is None or a.category_lc == category_lc)
+        and (priority_lc is None or a.priority_lc == priority_lc)
+    ]
+    
+    # Announcements are only ever appended, so the list is already in date
+    # order; reverse it for most recent first
+    return announcements[::-1]
 
 
 def format_announcement(announcement):
     """Format a single announcement for display."""
     lines = []
-    lines.append(f"📢 {announcement['company']}")
-    lines.append(f"📅 {announcement['date_added'][:10]}")
-    lines.append(f"🔸 {announcement['action']}")
-    lines.append(f"💡 AZ Implication: {announcement['implication']}")
-    lines.append(f"📎 Source: {announcement['source']}")
-    lines.append(f"🏷️  Category: {announcement['category']} | Priority: {announcement['priority']}")
+    lines.append(f"📢 {announcement.company}")
+    lines.append(f"📅 {announcement.date_added[:10]}")
+    lines.append(f"🔸 {announcement.action}")
+    lines.append(f"💡 AZ Implication: {announcement.implication}")
+    lines.append(f"📎 Source: {announcement.source}")
+    lines.append(f"🏷️  Category: {announcement.category} | Priority: {announcement.priority}")
     return '\n'.join(lines)
 
 
+# One announcement in the report's detailed section ({a.date_added:.10} keeps
+# just the YYYY-MM-DD part); the trailing newline leaves a blank line after it
+_REPORT_ENTRY_TEMPLATE = (
+    "### {index}. {a.company}\n"
+    "**Date:** {a.date_added:.10}\n"
+    "**Action:** {a.action}\n"
+    "**AZ Implication:** {a.implication}\n"
+    "**Source:** {a.source}\n"
+    "**Category:** {a.category} | **Priority:** {a.priority}\n"
+)
+
+
 def generate_report(days=7):
     """Generate a summary report of recent competitor activity."""
     database = load_database()
     all_announcements = database['announcements']
     
     # Filter for recent announcements
-    cutoff_date = datetime.now() - timedelta(days=days)
-    recent_announcements = [a for a in all_announcements 
-                           if datetime.fromisoformat(a['date_added']) >= cutoff_date]
-    
-    report = []
-    report.append(f"# Competitive Intelligence Report")
-    report.append(f"**Period:** Past {days} days")
-    report.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    report.append("")
-    
-    # Summary statistics
-    report.append("## Summary")
-    report.append(f"- Total announcements: {len(recent_announcements)}")
+    cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+    recent_announcements = [a for a in all_announcements if a.date_added_ts >= cutoff_ts]
+    
+    report = [
+        f"# Competitive Intelligence Report\n"
+        f"**Period:** Past {days} days\n"
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        f"\n"
+        f"## Summary\n"
+        f"- Total announcements: {len(recent_announcements)}"
+    ]
+    
+    # Tally companies, priorities and categories, and group by priority,
+    # in a single pass
+    companies, priorities, categories = Counter(), Counter(), Counter()
+    by_priority = defaultdict(list)
+    for a in recent_announcements:
+        companies[a.company] += 1
+        priorities[a.priority] += 1
+        categories[a.category] += 1
+        by_priority[a.priority].append(a)
     
     if recent_announcements:
         # Company breakdown
-        companies = {}
-        for a in recent_announcements:
-            companies[a['company']] = companies.get(a['company'], 0) + 1
-        
-        report.append("- Companies tracked:")
-        for company, count in sorted(companies.items()):
-            report.append(f"  - {company}: {count} announcements")
+        report.append("- Companies tracked:\n" + "\n".join(
+            f"  - {company}: {count} announcements" for company, count in sorted(companies.items())
+        ))
         
         # Priority breakdown
-        priorities = {}
-        for a in recent_announcements:
-            priorities[a['priority']] = priorities.get(a['priority'], 0) + 1
-        
-        report.append("- Priority distribution:")
-        for priority, count in sorted(priorities.items()):
-            report.append(f"  - {priority}: {count}")
+        report.append("- Priority distribution:\n" + "\n".join(
+            f"  - {priority}: {count}" for priority, count in sorted(priorities.items())
+        ))
     
     report.append("")
     
@@ -177,26 +450,22 @@ def generate_report(days=7):
     report.append("## Key Insights")
     if recent_announcements:
         # High priority items
-        high_priority = [a for a in recent_announcements if a['priority'] == 'high']
+        high_priority = by_priority.get('high', [])
         if high_priority:
             report.append(f"⚠️  **{len(high_priority)} high-priority announcements** require immediate attention:")
             for a in high_priority[:3]:  # Top 3 high priority
-                report.append(f"  - {a['company']}: {a['action']}")
+                report.append(f"  - {a.company}: {a.action}")
             report.append("")
         
         # Most active companies
         if len(companies) > 1:
-            most_active = max(companies.items(), key=lambda x: x[1])
+            most_active = companies.most_common(1)[0]
             report.append(f"📈 **Most active competitor:** {most_active[0]} ({most_active[1]} announcements)")
             report.append("")
         
         # Common themes
-        categories = {}
-        for a in recent_announcements:
-            categories[a['category']] = categories.get(a['category'], 0) + 1
-        
         if categories:
-            common_theme = max(categories.items(), key=lambda x: x[1])
+            common_theme = categories.most_common(1)[0]
             report.append(f"🎯 **Common theme:** {common_theme[0]} ({common_theme[1]} announcements)")
     else:
         report.append("- No competitive activity tracked in this period")
@@ -208,30 +477,40 @@ def generate_report(days=7):
     report.append("## Detailed Announcements")
     if recent_announcements:
         # Sort by priority and date
+        # (the list is already date ordered, and sort is stable)
         priority_order = {'high': 0, 'medium': 1, 'low': 2}
-        recent_announcements.sort(key=lambda x: (priority_order.get(x['priority'], 3), x['date_added']), reverse=True)
+        recent_announcements.reverse()
+        recent_announcements.sort(key=lambda x: priority_order.get(x.priority, 3), reverse=True)
         
-        for i, announcement in enumerate(recent_announcements, 1):
-            report.append(f"### {i}. {announcement['company']}")
-            report.append(f"**Date:** {announcement['date_added'][:10]}")
-            report.append(f"**Action:** {announcement['action']}")
-            report.append(f"**AZ Implication:** {announcement['implication']}")
-            report.append(f"**Source:** {announcement['source']}")
-            report.append(f"**Category:** {announcement['category']} | **Priority:** {announcement['priority']}")
-            report.append("")
+        report.extend(
+            _REPORT_ENTRY_TEMPLATE.format(index=i, a=announcement)
+            for i, announcement in enumerate(recent_announcements, 1)
+        )
     else:
         report.append("No announcements to display")
     
     return '\n'.join(report)
 
 
+def dump_database(pretty=False):
+    """Write the whole database to stdout as a single JSON document."""
+    database = load_database()
+    document = {
+        'metadata': database['metadata'],
+        'announcements': [_announcement_dict(a) for a in database['announcements']],
+    }
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(document, pretty=pretty) + b'\n')
+    sys.stdout.buffer.flush()
+
+
 def list_companies():
     """List all companies in the database."""
     database = load_database()
     companies = set()
     
     for announcement in database['announcements']:
-        companies.add(announcement['company'])
+        companies.add(announcement.company)
     
     return sorted(list(companies))
 
@@ -246,6 +525,7 @@ Examples:
     competitor-tracker query --company "Roche" --days 30
     competitor-tracker report --days 7
     competitor-tracker list
+    competitor-tracker dump --pretty
         """
     )
     
@@ -275,6 +555,10 @@ Examples:
     # List command
     list_parser = subparsers.add_parser('list', help='List all companies')
     
+    # Dump command
+    dump_parser = subparsers.add_parser('dump', help='Print the whole database as JSON')
+    dump_parser.add_argument('--pretty', action='store_true', help='Indent the JSON output for reading')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -314,6 +598,9 @@ Examples:
                 print(f"  - {company}")
         else:
             print("No companies in database")
+    
+    elif args.command == 'dump':
+        dump_database(args.pretty)
 
 
 if __name__ == '__main__':
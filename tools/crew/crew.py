@@ -6,57 +6,168 @@ Run and manage AI crews created with crw
 
 import os
 import sys
+import copy
 import json
 import argparse
-import subprocess
+from collections import OrderedDict, defaultdict, deque
 from pathlib import Path
 from datetime import datetime
 
+try:
+    # orjson is optional; it parses several times faster than json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import yaml
+    try:
+        # crew.yaml files are parsed on most commands; use libyaml when built in
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    yaml = None
+
 # Constants
 CREW_DIR = Path.home() / ".crew"
 CREWS_FILE = CREW_DIR / "crews.json"
+YAML_MISSING = "❌ PyYAML not installed. Install with: pip install pyyaml"
+
+# Parsed files, keyed by (path, parser) and checked against (mtime, size)
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_MAX = 100
+
+def _load_cached(path: Path, parse):
+    """Parse a file, reusing the last result while its mtime and size are unchanged
+
+    Returns a deep copy, so callers are free to modify it.
+    """
+    st = path.stat()
+    key = (str(path), parse)
+    cached = _PARSE_CACHE.get(key)
+    if cached is None or cached[0] != (st.st_mtime_ns, st.st_size):
+        cached = ((st.st_mtime_ns, st.st_size), parse(path.read_bytes()))
+        _PARSE_CACHE[key] = cached
+        if len(_PARSE_CACHE) > _PARSE_CACHE_MAX:
+            _PARSE_CACHE.popitem(last=False)
+    _PARSE_CACHE.move_to_end(key)
+    return copy.deepcopy(cached[1])
+
+def _parse_yaml(data: bytes):
+    """Safe-load YAML from bytes, with libyaml when PyYAML was built with it"""
+    return yaml.load(data, Loader=_YamlLoader)
+
+def _load_yaml_cached(path: Path):
+    """Parse a YAML file (callers check that PyYAML is installed)"""
+    return _load_cached(path, _parse_yaml)
+
+def _load_json_cached(path: Path):
+    """Parse a JSON file"""
+    return _load_cached(path, _json_loads)
+
+def _load_crew_config(crew_yaml: Path) -> dict:
+    """Load a crew.yaml, via a JSON copy kept next to it
+
+    JSON parses much faster than YAML, so the parsed config is saved as
+    .crew.yaml.json together with the YAML file's (mtime, size), and reused
+    until the YAML changes. Callers check that PyYAML is installed.
+    """
+    st = crew_yaml.stat()
+    source = [st.st_mtime_ns, st.st_size]
+    sidecar = crew_yaml.with_name(f".{crew_yaml.name}.json")
+    try:
+        cached = _load_json_cached(sidecar)
+        if cached.get('source') == source:
+            return cached['config']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
 
-def list_crews():
-    """List all available crews"""
-    if not CREW_DIR.exists():
-        print("❌ No crew directory found. Run 'crw init' first.")
-        sys.exit(1)
-
-    if not CREWS_FILE.exists():
-        print("❌ No crews registry found. Run 'crw init' first.")
+    config = _load_yaml_cached(crew_yaml)
+    try:
+        # Only cache configs that survive the round trip (no dates, no
+        # non-string keys); a read-only crew directory just means no cache
+        data = json.dumps({'source': source, 'config': config}).encode()
+        if _json_loads(data)['config'] == config:
+            tmp = sidecar.with_name(sidecar.name + '.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, sidecar)
+    except (OSError, TypeError, ValueError):
+        pass
+    return config
+
+def _load_crews() -> dict:
+    """Load the crews registry, exiting with an error if it is missing
+
+    The registry's stat doubles as the existence check; the crew directory
+    is only looked at to explain a failure.
+    """
+    try:
+        return _load_json_cached(CREWS_FILE)
+    except FileNotFoundError:
+        if not CREW_DIR.exists():
+            print("❌ No crew directory found. Run 'crw init' first.")
+        else:
+            print("❌ No crews registry found. Run 'crw init' first.")
         sys.exit(1)
 
-    crews = json.loads(CREWS_FILE.read_text())
+def list_crews():
+    """List all available crews"""
+    crews = _load_crews()
 
     if not crews:
         print("📭 No crews found. Create one with: crw create <name>")
         return
 
-    print(f"📋 Available crews ({len(crews)}):")
-    print()
+    # Collect the listing and write it in one go
+    out = [f"📋 Available crews ({len(crews)}):", ""]
     for crew_id, crew_info in crews.items():
         crew_dir = Path(crew_info["path"])
         crew_yaml = crew_dir / "crew.yaml"
 
         status = "✅ Ready" if crew_yaml.exists() else "⚠️  Missing config"
 
-        print(f"  • {crew_id}")
-        print(f"    {crew_info.get('description', 'No description')}")
-        print(f"    Status: {status}")
-        print(f"    Path: {crew_dir}")
-        print()
+        out.append(f"  • {crew_id}")
+        out.append(f"    {crew_info.get('description', 'No description')}")
+        out.append(f"    Status: {status}")
+        out.append(f"    Path: {crew_dir}")
+        out.append("")
+    print("\n".join(out))
+
+def _order_tasks(task_map: dict) -> list:
+    """Task IDs in dependency order (Kahn's algorithm)
+
+    Dependencies on unknown tasks are ignored. Tasks in a dependency cycle
+    can never be scheduled and are left out of the result.
+    """
+    indegree = {}
+    dependents = defaultdict(list)
+    for task_id, task in task_map.items():
+        deps = [dep for dep in task.get('depends_on', []) if dep in task_map]
+        indegree[task_id] = len(deps)
+        for dep in deps:
+            dependents[dep].append(task_id)
+
+    ordered = []
+    ready = deque(task_id for task_id, count in indegree.items() if count == 0)
+    while ready:
+        task_id = ready.popleft()
+        ordered.append(task_id)
+        for dependent in dependents[task_id]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    return ordered
+
+# Footer of every simulated task output file, encoded once
+_SIMULATION_NOTE = b"""
+Note: This is a simulation. Install CrewAI for real execution:
+pip install crewai
+"""
 
 def simulate_crew(name: str, verbose: bool = False):
     """Simulate crew execution (without CrewAI)"""
-    if not CREW_DIR.exists():
-        print("❌ No crew directory found")
-        sys.exit(1)
-
-    if not CREWS_FILE.exists():
-        print("❌ No crews registry found")
-        sys.exit(1)
-
-    crews = json.loads(CREWS_FILE.read_text())
+    crews = _load_crews()
 
     if name not in crews:
         print(f"❌ Crew '{name}' not found")
@@ -70,101 +181,92 @@ def simulate_crew(name: str, verbose: bool = False):
         sys.exit(1)
 
     # Read and parse YAML
-    try:
-        import yaml
-        config = yaml.safe_load(crew_yaml.read_text())
-    except ImportError:
-        print("❌ PyYAML not installed. Install with: pip install pyyaml")
+    if yaml is None:
+        print(YAML_MISSING)
         sys.exit(1)
+    try:
+        config = _load_crew_config(crew_yaml)
     except Exception as e:
         print(f"❌ Error reading crew.yaml: {e}")
         sys.exit(1)
 
-    # Display crew info
-    print(f"🚀 Simulating crew execution: {name}")
-    print(f"📝 Description: {config.get('name', name)}")
-    print()
+    # Display crew info (the overview is collected and written in one go)
+    out = [
+        f"🚀 Simulating crew execution: {name}",
+        f"📝 Description: {config.get('name', name)}",
+        "",
+    ]
 
     # Display agents
     agents = config.get('agents', [])
-    print(f"👥 Agents ({len(agents)}):")
+    # Lookup by ID; built in reverse so the first agent wins on duplicate IDs
+    agents_by_id = {a.get('id'): a for a in reversed(agents)}
+    out.append(f"👥 Agents ({len(agents)}):")
     for agent in agents:
-        print(f"  • {agent.get('name')} ({agent.get('role')})")
+        out.append(f"  • {agent.get('name')} ({agent.get('role')})")
         if verbose:
-            print(f"      Goal: {agent.get('goal')}")
-            print(f"      LLM: {agent.get('llm', 'default')}")
-            print(f"      Tools: {len(agent.get('tools', []))}")
-    print()
+            out.append(f"      Goal: {agent.get('goal')}")
+            out.append(f"      LLM: {agent.get('llm', 'default')}")
+            out.append(f"      Tools: {len(agent.get('tools', []))}")
+    out.append("")
 
     # Display tasks
     tasks = config.get('tasks', [])
-    print(f"📋 Tasks ({len(tasks)}):")
+    out.append(f"📋 Tasks ({len(tasks)}):")
     for task in tasks:
         agent_id = task.get('agent', 'unknown')
-        agent_name = next((a.get('name') for a in agents if a.get('id') == agent_id), agent_id)
+        agent = agents_by_id.get(agent_id)
+        agent_name = agent.get('name') if agent is not None else agent_id
         deps = task.get('depends_on', [])
         deps_str = f" (depends on: {', '.join(deps)})" if deps else ""
 
-        print(f"  • {task.get('name')} - {agent_name}{deps_str}")
+        out.append(f"  • {task.get('name')} - {agent_name}{deps_str}")
         if verbose:
-            print(f"      Description: {task.get('description')}")
-            print(f"      Expected: {task.get('expected_output', 'N/A')}")
-    print()
+            out.append(f"      Description: {task.get('description')}")
+            out.append(f"      Expected: {task.get('expected_output', 'N/A')}")
+    out.append("")
 
     # Display execution mode
     execution = config.get('execution', {})
     process = execution.get('process', 'sequential')
-    print(f"⚙️  Execution mode: {process}")
+    out.append(f"⚙️  Execution mode: {process}")
     if verbose:
-        print(f"   Manager LLM: {execution.get('manager_llm', 'default')}")
-        print(f"   Verbose: {execution.get('verbose', True)}")
-    print()
+        out.append(f"   Manager LLM: {execution.get('manager_llm', 'default')}")
+        out.append(f"   Verbose: {execution.get('verbose', True)}")
+    out.append("")
 
     # Simulate execution
-    print("🔄 Executing tasks...")
-    print()
+    out.append("🔄 Executing tasks...")
+    out.append("")
+    print("\n".join(out))
 
     # Determine execution order
     task_map = {t.get('id'): t for t in tasks}
-
-    def get_task_order(task_id: str, visited: set) -> list:
-        """Get tasks in dependency order"""
-        if task_id in visited:
-            return []
-        visited.add(task_id)
-
-        task = task_map.get(task_id)
-        if not task:
-            return []
-
-        order = []
-        for dep in task.get('depends_on', []):
-            order.extend(get_task_order(dep, visited))
-        order.append(task_id)
-        return order
-
-    # Get all task IDs in order
-    ordered_tasks = []
-    visited = set()
-    for task_id in task_map:
-        ordered_tasks.extend(get_task_order(task_id, visited))
-
-    # Remove duplicates while preserving order
-    seen = set()
-    ordered_tasks = [t for t in ordered_tasks if not (t in seen or seen.add(t))]
+    ordered_tasks = _order_tasks(task_map)
+
+    # Tasks caught in a dependency cycle never become ready; refuse to run
+    # before anything is written, rather than leave a partial output dir
+    if len(ordered_tasks) < len(task_map):
+        stuck = set(task_map) - set(ordered_tasks)
+        print(f"❌ Cycle detected in task dependencies involving: "
+              f"{', '.join(sorted(map(str, stuck)))}")
+        sys.exit(1)
 
     # Execute tasks
     output_dir = crew_dir / "output"
     output_dir.mkdir(exist_ok=True)
 
+    # The simulation is instantaneous, so every task shares one timestamp
+    run_ts = datetime.now().isoformat()
     for i, task_id in enumerate(ordered_tasks, 1):
         task = task_map[task_id]
         agent_id = task.get('agent')
-        agent = next((a for a in agents if a.get('id') == agent_id), None)
+        agent = agents_by_id.get(agent_id)
 
-        print(f"[{i}/{len(ordered_tasks)}] {task.get('name')}")
-        print(f"    Agent: {agent.get('name') if agent else 'Unknown'}")
-        print(f"    Status: Executing...")
+        # One write before and one after each task, so progress stays live
+        print(f"[{i}/{len(ordered_tasks)}] {task.get('name')}\n"
+              f"    Agent: {agent.get('name') if agent else 'Unknown'}\n"
+              f"    Status: Executing...", flush=True)
 
         # Simulate output
         output_file = output_dir / f"{task_id}.txt"
@@ -172,16 +274,12 @@ def simulate_crew(name: str, verbose: bool = False):
 Agent: {agent.get('name') if agent else 'Unknown'}
 Description: {task.get('description')}
 Expected Output: {task.get('expected_output', 'N/A')}
-Timestamp: {datetime.now().isoformat()}
+Timestamp: {run_ts}
+""".encode()
+        output_file.write_bytes(output_content + _SIMULATION_NOTE)
 
-Note: This is a simulation. Install CrewAI for real execution:
-pip install crewai
-"""
-        output_file.write_text(output_content)
-
-        print(f"    Status: ✅ Complete")
-        print(f"    Output: {output_file}")
-        print()
+        print(f"    Status: ✅ Complete\n"
+              f"    Output: {output_file}\n")
 
     print(f"✅ Crew '{name}' execution complete!")
     print(f"📂 Output directory: {output_dir}")
@@ -205,15 +303,7 @@ def run_crew(name: str, verbose: bool = False):
 
 def validate_crew(name: str):
     """Validate crew configuration"""
-    if not CREW_DIR.exists():
-        print("❌ No crew directory found")
-        sys.exit(1)
-
-    if not CREWS_FILE.exists():
-        print("❌ No crews registry found")
-        sys.exit(1)
-
-    crews = json.loads(CREWS_FILE.read_text())
+    crews = _load_crews()
 
     if name not in crews:
         print(f"❌ Crew '{name}' not found")
@@ -227,12 +317,10 @@ def validate_crew(name: str):
         sys.exit(1)
 
     # Read and parse YAML
-    try:
-        import yaml
-        config = yaml.safe_load(crew_yaml.read_text())
-    except ImportError:
-        print("⚠️  PyYAML not installed")
+    if yaml is None:
+        print(YAML_MISSING)
         sys.exit(1)
+    config = _load_crew_config(crew_yaml)
 
     errors = []
     warnings = []
@@ -262,16 +350,19 @@ def validate_crew(name: str):
         if 'name' not in agent:
             errors.append(f"Agent {i}: missing 'name'")
 
-    # Validate tasks
-    task_ids = set()
-    for i, task in enumerate(config.get('tasks', [])):
+    # Validate tasks; collect every ID first so dependencies may refer to
+    # tasks defined later in the file
+    tasks = config.get('tasks', [])
+    task_ids = {task['id'] for task in tasks if 'id' in task}
+    seen_task_ids = set()
+    for i, task in enumerate(tasks):
         if 'id' not in task:
             errors.append(f"Task {i}: missing 'id'")
         else:
             task_id = task['id']
-            if task_id in task_ids:
+            if task_id in seen_task_ids:
                 errors.append(f"Duplicate task ID: {task_id}")
-            task_ids.add(task_id)
+            seen_task_ids.add(task_id)
 
         if 'name' not in task:
             errors.append(f"Task {i}: missing 'name'")
@@ -286,6 +377,13 @@ def validate_crew(name: str):
             if dep not in task_ids:
                 errors.append(f"Task {i}: dependency '{dep}' not found")
 
+    # Tasks that can never be scheduled are in, or depend on, a cycle
+    task_map = {task['id']: task for task in tasks if 'id' in task}
+    scheduled = set(_order_tasks(task_map))
+    if len(scheduled) < len(task_map):
+        blocked = [str(task_id) for task_id in task_map if task_id not in scheduled]
+        errors.append(f"Circular dependency blocks tasks: {', '.join(blocked)}")
+
     # Display results
     if errors:
         print(f"❌ Validation failed: {len(errors)} error(s)")
@@ -300,17 +398,29 @@ def validate_crew(name: str):
         print(f"📋 Tasks: {len(config.get('tasks', []))}")
         print(f"⚙️  Execution: {config.get('execution', {}).get('process', 'sequential')}")
 
-def export_python(name: str, output: str = None):
-    """Export crew to Python script"""
-    if not CREW_DIR.exists():
-        print("❌ No crew directory found")
-        sys.exit(1)
+# Code generated per agent and task by export_python; !r quotes the YAML
+# values as Python literals, so quotes and newlines in them are escaped
+_AGENT_TEMPLATE = """
+agents[{id!r}] = Agent(
+    role={role!r},
+    goal={goal!r},
+    backstory={backstory!r},
+    verbose={verbose!r}
+)
+"""
 
-    if not CREWS_FILE.exists():
-        print("❌ No crews registry found")
-        sys.exit(1)
+_TASK_TEMPLATE = """
+tasks[{id!r}] = Task(
+    description={description!r},
+    expected_output={expected_output!r},
+    agent=agents[{agent!r}],
+    context={context}
+)
+"""
 
-    crews = json.loads(CREWS_FILE.read_text())
+def export_python(name: str, output: str = None):
+    """Export crew to Python script"""
+    crews = _load_crews()
 
     if name not in crews:
         print(f"❌ Crew '{name}' not found")
@@ -324,41 +434,33 @@ def export_python(name: str, output: str = None):
         sys.exit(1)
 
     # Read and parse YAML
-    try:
-        import yaml
-        config = yaml.safe_load(crew_yaml.read_text())
-    except ImportError:
-        print("❌ PyYAML not installed")
+    if yaml is None:
+        print(YAML_MISSING)
         sys.exit(1)
+    config = _load_crew_config(crew_yaml)
 
     # Generate Python script
-    agents_code = []
-    for agent in config.get('agents', []):
-        agents_code.append(f'''
-agents['{agent['id']}'] = Agent(
-    role="{agent['role']}",
-    goal="{agent['goal']}",
-    backstory="{agent.get('backstory', '')}",
-    verbose={agent.get('verbose', True)}
-)
-''')
+    agents_code = ''.join(
+        _AGENT_TEMPLATE.format(
+            id=agent['id'],
+            role=agent['role'],
+            goal=agent['goal'],
+            backstory=agent.get('backstory', ''),
+            verbose=agent.get('verbose', True),
+        )
+        for agent in config.get('agents', [])
+    )
 
-    tasks_code = []
-    for task in config.get('tasks', []):
-        deps = task.get('depends_on', [])
-        if deps:
-            deps_list = '[' + ', '.join([f"tasks['{dep}']" for dep in deps]) + ']'
-        else:
-            deps_list = '[]'
-
-        tasks_code.append(f'''
-tasks['{task['id']}'] = Task(
-    description="{task['description']}",
-    expected_output="{task.get('expected_output', '')}",
-    agent=agents['{task['agent']}'],
-    context={deps_list}
-)
-''')
+    tasks_code = ''.join(
+        _TASK_TEMPLATE.format(
+            id=task['id'],
+            description=task['description'],
+            expected_output=task.get('expected_output', ''),
+            agent=task['agent'],
+            context='[' + ', '.join([f"tasks[{dep!r}]" for dep in task.get('depends_on', [])]) + ']',
+        )
+        for task in config.get('tasks', [])
+    )
 
     script = f'''#!/usr/bin/env python3
 """
@@ -369,10 +471,10 @@ Generated from crew.yaml on {datetime.now().isoformat()}
 from crewai import Agent, Task, Crew, Process
 
 # Define Agents
-{''.join(agents_code)}
+{agents_code}
 
 # Define Tasks
-{''.join(tasks_code)}
+{tasks_code}
 
 # Create Crew
 crew = Crew(
@@ -411,26 +513,31 @@ Examples:
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # list command
-    subparsers.add_parser("list", help="List all crews")
+    list_parser = subparsers.add_parser("list", help="List all crews")
+    list_parser.set_defaults(func=lambda args: list_crews())
 
     # simulate command
     simulate_parser = subparsers.add_parser("simulate", help="Simulate crew execution")
     simulate_parser.add_argument("name", help="Crew name")
     simulate_parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    simulate_parser.set_defaults(func=lambda args: simulate_crew(args.name, args.verbose))
 
     # run command
     run_parser = subparsers.add_parser("run", help="Run crew with CrewAI")
     run_parser.add_argument("name", help="Crew name")
     run_parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    run_parser.set_defaults(func=lambda args: run_crew(args.name, args.verbose))
 
     # validate command
     validate_parser = subparsers.add_parser("validate", help="Validate crew configuration")
     validate_parser.add_argument("name", help="Crew name")
+    validate_parser.set_defaults(func=lambda args: validate_crew(args.name))
 
     # export command
     export_parser = subparsers.add_parser("export", help="Export crew to Python")
     export_parser.add_argument("name", help="Crew name")
     export_parser.add_argument("-o", "--output", help="Output file")
+    export_parser.set_defaults(func=lambda args: export_python(args.name, args.output))
 
     args = parser.parse_args()
 
@@ -439,16 +546,7 @@ Examples:
         sys.exit(1)
 
     # Execute command
-    if args.command == "list":
-        list_crews()
-    elif args.command == "simulate":
-        simulate_crew(args.name, args.verbose)
-    elif args.command == "run":
-        run_crew(args.name, args.verbose)
-    elif args.command == "validate":
-        validate_crew(args.name)
-    elif args.command == "export":
-        export_python(args.name, args.output)
+    args.func(args)
 
 if __name__ == "__main__":
     main()
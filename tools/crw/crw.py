@@ -13,6 +13,12 @@ from pathlib import Path
 from datetime import datetime
 import yaml
 
+try:
+    # C loader if PyYAML was built against libyaml, else the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Constants
 CREW_DIR = Path.home() / ".crew"
 CREWS_FILE = CREW_DIR / "crews.json"
@@ -203,7 +209,7 @@ def show_crew(name):
         print("📄 Configuration (crew.yaml):")
         print("-" * 60)
         try:
-            config = yaml.safe_load(crew_yaml.read_text())
+            config = yaml.load(crew_yaml.read_bytes(), Loader=_YamlLoader)
             print(f"Version: {config.get('version', 'N/A')}")
             print(f"Agents: {len(config.get('agents', []))}")
             print(f"Tasks: {len(config.get('tasks', []))}")
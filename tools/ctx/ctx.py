@@ -6,176 +6,329 @@ Manage context, sessions, and knowledge for AI agent workflows
 
 import os
 import sys
+import copy
 import json
+import hashlib
+import inspect
 import argparse
+from collections import deque
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime
 from typing import Dict, List, Optional
-import subprocess
+
+try:
+    # orjson is optional; it parses and serializes several times faster
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _loads(data: bytes):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    def _dumps_line(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode() + b"\n"
 
 # Constants
 CTX_DIR = Path.home() / ".ctx"
 SESSIONS_FILE = CTX_DIR / "sessions.json"
 KNOWLEDGE_FILE = CTX_DIR / "knowledge.json"
 TEMPLATE_FILE = CTX_DIR / "templates.json"
+# Per-session history and knowledge logs, one JSON entry per line
+SESSION_LOG_DIR = CTX_DIR / "sessions"
+
+# Parsed JSON files, keyed by path and checked against (mtime, size)
+_JSON_CACHE = {}
+# Digest of each file's contents as last read or written by this process
+_JSON_DIGESTS = {}
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _read_json(path: Path):
+    """Parse a JSON file, reusing the last result while its mtime and size are unchanged
+
+    Returns a deep copy, so callers are free to modify it.
+    """
+    st = path.stat()
+    cached = _JSON_CACHE.get(path)
+    if cached is None or cached[0] != (st.st_mtime_ns, st.st_size):
+        raw = path.read_bytes()
+        cached = ((st.st_mtime_ns, st.st_size), _loads(raw))
+        _JSON_CACHE[path] = cached
+        _JSON_DIGESTS[path] = _digest(raw)
+    return copy.deepcopy(cached[1])
+
+def _save_json(path: Path, obj):
+    """Write obj as JSON atomically, skipping the write if the contents are unchanged"""
+    data = _dumps(obj)
+    digest = _digest(data)
+    if _JSON_DIGESTS.get(path) == digest and path.exists():
+        return
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    _JSON_DIGESTS[path] = digest
 
 def init():
     """Initialize ctx directory structure"""
     CTX_DIR.mkdir(parents=True, exist_ok=True)
     if not SESSIONS_FILE.exists():
-        SESSIONS_FILE.write_text(json.dumps({}, indent=2))
+        _save_json(SESSIONS_FILE, {})
     if not KNOWLEDGE_FILE.exists():
-        KNOWLEDGE_FILE.write_text(json.dumps({}, indent=2))
+        _save_json(KNOWLEDGE_FILE, {})
     if not TEMPLATE_FILE.exists():
-        TEMPLATE_FILE.write_text(json.dumps({
+        _save_json(TEMPLATE_FILE, {
             "default": {
                 "name": "default",
                 "context": "You are a helpful AI assistant",
                 "tools": ["web_search", "file_read", "file_write"],
                 "rules": ["Be concise", "Provide code examples"]
             }
-        }, indent=2))
+        })
     print(f"✅ Initialized ctx directory: {CTX_DIR}")
 
-def create_session(name: str, description: str = "", template: Optional[str] = None):
-    """Create a new AI session with context"""
-    if not SESSIONS_FILE.exists():
+def _log_path(name: str, kind: str) -> Path:
+    """Path of a session's "history" or "knowledge" log"""
+    return SESSION_LOG_DIR / f"{quote(name, safe='')}.{kind}.jsonl"
+
+def _read_log(name: str, kind: str) -> List[Dict]:
+    """All entries of a session log"""
+    try:
+        with open(_log_path(name, kind), 'rb') as f:
+            return [_loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+def _tail_log(name: str, kind: str, count: int):
+    """(number of entries, last count entries) of a session log
+
+    Only the last count lines are parsed.
+    """
+    total = 0
+    tail = deque(maxlen=count)
+    try:
+        with open(_log_path(name, kind), 'rb') as f:
+            for line in f:
+                if line.strip():
+                    total += 1
+                    tail.append(line)
+    except FileNotFoundError:
+        pass
+    return total, [_loads(line) for line in tail]
+
+# Log changes made by the commands below, written by _save_sessions() so that
+# a failing batch leaves the logs untouched as well
+_pending_log_entries = {}
+_pending_log_removals = set()
+
+def _append_log(name: str, kind: str, entry: Dict):
+    _pending_log_entries.setdefault(_log_path(name, kind), []).append(entry)
+
+def _remove_logs(name: str):
+    for kind in ("history", "knowledge"):
+        path = _log_path(name, kind)
+        _pending_log_entries.pop(path, None)
+        _pending_log_removals.add(path)
+
+def _save_sessions(sessions: Dict):
+    """Apply pending log changes, then save the session registry"""
+    for path in _pending_log_removals:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    _pending_log_removals.clear()
+
+    if _pending_log_entries:
+        SESSION_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    for path, entries in _pending_log_entries.items():
+        with open(path, 'ab') as f:
+            f.write(b"".join(_dumps_line(entry) for entry in entries))
+    _pending_log_entries.clear()
+
+    _save_json(SESSIONS_FILE, sessions)
+
+def _migrate_session_logs(sessions: Dict) -> bool:
+    """Move history/knowledge lists stored inline by older versions into logs"""
+    migrated = False
+    for name, session in sessions.items():
+        for kind in ("history", "knowledge"):
+            entries = session.pop(kind, None)
+            if entries is None:
+                continue
+            migrated = True
+            if entries:
+                # Overwrite rather than append, so an interrupted migration
+                # can simply run again
+                SESSION_LOG_DIR.mkdir(parents=True, exist_ok=True)
+                _log_path(name, kind).write_bytes(b"".join(_dumps_line(e) for e in entries))
+    return migrated
+
+def _load_sessions() -> Dict:
+    """Load all sessions, initializing ctx on first use"""
+    try:
+        sessions = _read_json(SESSIONS_FILE)
+    except FileNotFoundError:
         init()
+        sessions = _read_json(SESSIONS_FILE)
+    if _migrate_session_logs(sessions):
+        _save_json(SESSIONS_FILE, sessions)
+    return sessions
+
+def _get_session(sessions: Dict, name: str) -> Dict:
+    """Return a session, exiting with an error if it does not exist"""
+    if name not in sessions:
+        print(f"❌ Session '{name}' not found")
+        sys.exit(1)
+    return sessions[name]
 
-    sessions = json.loads(SESSIONS_FILE.read_text())
+# The _create/_update/... functions below apply one command to the in-memory
+# sessions dict; the CLI wrappers and `ctx batch` handle loading and saving
 
+def _create(sessions: Dict, name: str, description: str = "", template: Optional[str] = None):
     if name in sessions:
         print(f"❌ Session '{name}' already exists")
         sys.exit(1)
 
-    # Load template if specified
+    # Load template if specified; its lists are copied so the session
+    # never shares them with the template
     context_data = {}
     if template:
-        templates = json.loads(TEMPLATE_FILE.read_text())
+        templates = _read_json(TEMPLATE_FILE)
         if template not in templates:
             print(f"❌ Template '{template}' not found")
             sys.exit(1)
-        context_data = templates[template].copy()
+        context_data = templates[template]
+    context = context_data.get("context", "")
+    tools = list(context_data.get("tools", []))
+    rules = list(context_data.get("rules", []))
 
     # Create session
+    now = datetime.now().isoformat()
     sessions[name] = {
         "description": description or f"Session: {name}",
-        "created": datetime.now().isoformat(),
-        "updated": datetime.now().isoformat(),
-        "context": context_data.get("context", ""),
-        "tools": context_data.get("tools", []),
-        "rules": context_data.get("rules", []),
-        "history": [],
-        "knowledge": [],
+        "created": now,
+        "updated": now,
+        "context": context,
+        "tools": tools,
+        "rules": rules,
         "active": True
     }
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
 
     print(f"✅ Created session: {name}")
     print(f"📝 {description or 'No description'}")
     print(f"📅 Created: {sessions[name]['created']}")
 
+def create_session(name: str, description: str = "", template: Optional[str] = None):
+    """Create a new AI session with context"""
+    sessions = _load_sessions()
+    _create(sessions, name, description, template)
+    _save_sessions(sessions)
+
 def list_sessions(show_all: bool = False):
     """List all AI sessions"""
-    if not SESSIONS_FILE.exists():
-        init()
-
-    sessions = json.loads(SESSIONS_FILE.read_text())
+    sessions = _load_sessions()
 
     if not sessions:
         print("📭 No sessions found. Create one with: ctx create <name>")
         return
 
-    active_sessions = {k: v for k, v in sessions.items() if v.get("active", False)}
-    archived_sessions = {k: v for k, v in sessions.items() if not v.get("active", False)}
-
-    if active_sessions:
-        print(f"🟢 Active Sessions ({len(active_sessions)}):")
-        print()
-        for name, session in active_sessions.items():
-            print(f"  • {name}")
-            print(f"    {session.get('description', 'No description')}")
-            print(f"    Updated: {session['updated']}")
-            if session.get('context'):
-                print(f"    Context: {session['context'][:50]}...")
-            print()
-
-    if archived_sessions and show_all:
-        print(f"⚪ Archived Sessions ({len(archived_sessions)}):")
-        print()
-        for name, session in archived_sessions.items():
-            print(f"  • {name}")
-            print(f"    Updated: {session['updated']}")
-            print()
+    # Format both groups in a single pass, one block of lines per session
+    active_blocks = []
+    archived_blocks = []
+    for name, session in sessions.items():
+        if session.get("active", False):
+            context = session.get('context')
+            active_blocks.append(
+                f"  • {name}\n"
+                f"    {session.get('description', 'No description')}\n"
+                f"    Updated: {session['updated']}\n"
+                + (f"    Context: {context[:50]}...\n" if context else "")
+                + "\n"
+            )
+        else:
+            archived_blocks.append(f"  • {name}\n    Updated: {session['updated']}\n\n")
 
-def show_session(name: str):
-    """Show session details"""
-    if not SESSIONS_FILE.exists():
-        init()
+    out = []
+    if active_blocks:
+        out.append(f"🟢 Active Sessions ({len(active_blocks)}):\n\n")
+        out.extend(active_blocks)
 
-    sessions = json.loads(SESSIONS_FILE.read_text())
+    if archived_blocks and show_all:
+        out.append(f"⚪ Archived Sessions ({len(archived_blocks)}):\n\n")
+        out.extend(archived_blocks)
 
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
-
-    session = sessions[name]
+    sys.stdout.writelines(out)
 
-    print(f"📋 Session: {name}")
-    print(f"📝 {session['description']}")
-    print(f"📅 Created: {session['created']}")
-    print(f"🔄 Updated: {session['updated']}")
-    print(f"🟢 Status: {'Active' if session['active'] else 'Archived'}")
-    print()
+def show_session(name: str):
+    """Show session details"""
+    session = _get_session(_load_sessions(), name)
+
+    # Collect the details and write them in one go
+    out = [
+        f"📋 Session: {name}",
+        f"📝 {session['description']}",
+        f"📅 Created: {session['created']}",
+        f"🔄 Updated: {session['updated']}",
+        f"🟢 Status: {'Active' if session['active'] else 'Archived'}",
+        "",
+    ]
 
     if session.get('context'):
-        print("🧠 Context:")
-        print(f"   {session['context']}")
-        print()
+        out.append("🧠 Context:")
+        out.append(f"   {session['context']}")
+        out.append("")
 
     if session.get('tools'):
-        print("🛠️  Available Tools:")
+        out.append("🛠️  Available Tools:")
         for tool in session['tools']:
-            print(f"   • {tool}")
-        print()
+            out.append(f"   • {tool}")
+        out.append("")
 
     if session.get('rules'):
-        print("📜 Rules:")
+        out.append("📜 Rules:")
         for rule in session['rules']:
-            print(f"   • {rule}")
-        print()
+            out.append(f"   • {rule}")
+        out.append("")
 
-    if session.get('history'):
-        print(f"📜 History ({len(session['history'])} entries):")
-        for i, entry in enumerate(session['history'][-5:], 1):
+    history_count, history_tail = _tail_log(name, "history", 5)
+    if history_count:
+        out.append(f"📜 History ({history_count} entries):")
+        for i, entry in enumerate(history_tail, 1):
             timestamp = entry.get('timestamp', 'Unknown')
             message = entry.get('message', '')[:50]
-            print(f"   {i}. [{timestamp}] {message}...")
-        print()
+            out.append(f"   {i}. [{timestamp}] {message}...")
+        out.append("")
 
-    if session.get('knowledge'):
-        print(f"📚 Knowledge Base ({len(session['knowledge'])} items):")
-        for item in session['knowledge'][-5:]:
+    knowledge_count, knowledge_tail = _tail_log(name, "knowledge", 5)
+    if knowledge_count:
+        out.append(f"📚 Knowledge Base ({knowledge_count} items):")
+        for item in knowledge_tail:
             title = item.get('title', 'Unknown')
-            print(f"   • {title}")
-        print()
+            out.append(f"   • {title}")
+        out.append("")
 
-def update_session(name: str, context: Optional[str] = None, add_tool: Optional[str] = None,
-                add_rule: Optional[str] = None, description: Optional[str] = None):
-    """Update session context or metadata"""
-    if not SESSIONS_FILE.exists():
-        init()
-
-    sessions = json.loads(SESSIONS_FILE.read_text())
-
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
+    print("\n".join(out))
 
-    session = sessions[name]
+def _update(sessions: Dict, name: str, context: Optional[str] = None, add_tool: Optional[str] = None,
+            add_rule: Optional[str] = None, description: Optional[str] = None) -> bool:
+    session = _get_session(sessions, name)
+    changed = False
 
     if context:
         session['context'] = context
+        changed = True
         print(f"✅ Updated context for '{name}'")
 
     if add_tool:
@@ -183,6 +336,7 @@ def update_session(name: str, context: Optional[str] = None, add_tool: Optional[
             session['tools'] = []
         if add_tool not in session['tools']:
             session['tools'].append(add_tool)
+            changed = True
             print(f"✅ Added tool '{add_tool}' to '{name}'")
         else:
             print(f"⚠️  Tool '{add_tool}' already in session")
@@ -192,63 +346,63 @@ def update_session(name: str, context: Optional[str] = None, add_tool: Optional[
             session['rules'] = []
         if add_rule not in session['rules']:
             session['rules'].append(add_rule)
+            changed = True
             print(f"✅ Added rule '{add_rule}' to '{name}'")
         else:
             print(f"⚠️  Rule '{add_rule}' already in session")
 
     if description:
         session['description'] = description
+        changed = True
         print(f"✅ Updated description for '{name}'")
 
+    # Leave the updated timestamp alone if nothing changed
+    if changed:
+        session['updated'] = datetime.now().isoformat()
+    return changed
+
+def update_session(name: str, context: Optional[str] = None, add_tool: Optional[str] = None,
+                add_rule: Optional[str] = None, description: Optional[str] = None):
+    """Update session context or metadata"""
+    sessions = _load_sessions()
+    if _update(sessions, name, context, add_tool, add_rule, description):
+        _save_sessions(sessions)
+
+def _archive(sessions: Dict, name: str):
+    session = _get_session(sessions, name)
+    session['active'] = False
     session['updated'] = datetime.now().isoformat()
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
+    print(f"📦 Archived session: {name}")
 
 def archive_session(name: str):
     """Archive a session (set to inactive)"""
-    if not SESSIONS_FILE.exists():
-        init()
-
-    sessions = json.loads(SESSIONS_FILE.read_text())
+    sessions = _load_sessions()
+    _archive(sessions, name)
+    _save_sessions(sessions)
 
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
-
-    sessions[name]['active'] = False
-    sessions[name]['updated'] = datetime.now().isoformat()
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
-
-    print(f"📦 Archived session: {name}")
+def _activate(sessions: Dict, name: str):
+    session = _get_session(sessions, name)
+    session['active'] = True
+    session['updated'] = datetime.now().isoformat()
+    print(f"✅ Activated session: {name}")
 
 def activate_session(name: str):
     """Activate an archived session"""
-    if not SESSIONS_FILE.exists():
-        init()
-
-    sessions = json.loads(SESSIONS_FILE.read_text())
-
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
-
-    sessions[name]['active'] = True
-    sessions[name]['updated'] = datetime.now().isoformat()
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
-
-    print(f"✅ Activated session: {name}")
+    sessions = _load_sessions()
+    _activate(sessions, name)
+    _save_sessions(sessions)
 
 def export_session(name: str, output: Optional[str] = None):
     """Export session context to file or stdout"""
-    if not SESSIONS_FILE.exists():
-        init()
+    session = _get_session(_load_sessions(), name)
 
-    sessions = json.loads(SESSIONS_FILE.read_text())
-
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
-
-    session = sessions[name]
+    # Build the list sections first, then format the prompt once
+    history = _read_log(name, "history")
+    knowledge = _read_log(name, "knowledge")
+    tools_line = ', '.join(session.get('tools', ['None']))
+    rules_block = '\n'.join([f"- {rule}" for rule in session.get('rules', ['None'])])
+    history_block = '\n'.join([f"- {h.get('timestamp', 'Unknown')}: {h.get('message', '')}" for h in history])
+    knowledge_block = '\n'.join([f"- {k.get('title', '')}: {k.get('content', '')[:50]}..." for k in knowledge])
 
     # Format as context prompt
     context_text = f"""# Context for {name}
@@ -260,16 +414,16 @@ def export_session(name: str, output: Optional[str] = None):
 {session.get('context', 'No system context defined')}
 
 ## Available Tools
-{', '.join(session.get('tools', ['None']))}
+{tools_line}
 
 ## Rules
-{chr(10).join(f"- {rule}" for rule in session.get('rules', ['None']))}
+{rules_block}
 
-## Session History ({len(session.get('history', []))} entries)
-{chr(10).join(f"- {h.get('timestamp', 'Unknown')}: {h.get('message', '')}" for h in session.get('history', []))}
+## Session History ({len(history)} entries)
+{history_block}
 
-## Knowledge Base ({len(session.get('knowledge', []))} items)
-{chr(10).join(f"- {k.get('title', '')}: {k.get('content', '')[:50]}..." for k in session.get('knowledge', []))}
+## Knowledge Base ({len(knowledge)} items)
+{knowledge_block}
 """
 
     if output:
@@ -278,47 +432,81 @@ def export_session(name: str, output: Optional[str] = None):
     else:
         print(context_text)
 
-def add_knowledge(name: str, title: str, content: str, tags: Optional[List[str]] = None):
-    """Add knowledge to a session"""
-    if not SESSIONS_FILE.exists():
-        init()
-
-    sessions = json.loads(SESSIONS_FILE.read_text())
+def _add_knowledge(sessions: Dict, name: str, title: str, content: str, tags: Optional[List[str]] = None):
+    session = _get_session(sessions, name)
 
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
-        sys.exit(1)
-
-    if 'knowledge' not in sessions[name]:
-        sessions[name]['knowledge'] = []
-
-    sessions[name]['knowledge'].append({
+    now = datetime.now().isoformat()
+    _append_log(name, "knowledge", {
         "title": title,
         "content": content,
         "tags": tags or [],
-        "added": datetime.now().isoformat()
+        "added": now
     })
 
-    sessions[name]['updated'] = datetime.now().isoformat()
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
-
+    session['updated'] = now
     print(f"✅ Added knowledge '{title}' to session '{name}'")
 
-def delete_session(name: str):
-    """Delete a session"""
-    if not SESSIONS_FILE.exists():
-        init()
+def add_knowledge(name: str, title: str, content: str, tags: Optional[List[str]] = None):
+    """Add knowledge to a session"""
+    sessions = _load_sessions()
+    _add_knowledge(sessions, name, title, content, tags)
+    _save_sessions(sessions)
 
-    sessions = json.loads(SESSIONS_FILE.read_text())
+def _delete(sessions: Dict, name: str):
+    _get_session(sessions, name)
+    del sessions[name]
+    _remove_logs(name)
+    print(f"🗑️  Deleted session: {name}")
 
-    if name not in sessions:
-        print(f"❌ Session '{name}' not found")
+def delete_session(name: str):
+    """Delete a session"""
+    sessions = _load_sessions()
+    _delete(sessions, name)
+    _save_sessions(sessions)
+
+# Commands a batch script may use, mapped to their in-memory implementations
+_BATCH_COMMANDS = {
+    "create": _create,
+    "update": _update,
+    "archive": _archive,
+    "activate": _activate,
+    "add-knowledge": _add_knowledge,
+    "delete": _delete,
+}
+
+def run_batch(script: str):
+    """Apply a JSON list of commands with a single load and save of the sessions
+
+    Each entry names a command plus its arguments, for example
+    {"command": "update", "name": "dev", "add_tool": "web_search"}.
+    Nothing is saved if any command fails.
+    """
+    try:
+        operations = _loads(Path(script).read_bytes())
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read batch script: {e}")
+        sys.exit(1)
+    if not isinstance(operations, list):
+        print("❌ Batch script must be a JSON list of commands")
         sys.exit(1)
 
-    del sessions[name]
-    SESSIONS_FILE.write_text(json.dumps(sessions, indent=2))
+    sessions = _load_sessions()
+    for i, operation in enumerate(operations, 1):
+        arguments = dict(operation) if isinstance(operation, dict) else {}
+        command = arguments.pop("command", None)
+        func = _BATCH_COMMANDS.get(command)
+        if func is None:
+            print(f"❌ Command {i}: unknown command '{command}'")
+            sys.exit(1)
+        try:
+            inspect.signature(func).bind(sessions, **arguments)
+        except TypeError as e:
+            print(f"❌ Command {i} ({command}): {e}")
+            sys.exit(1)
+        func(sessions, **arguments)
 
-    print(f"🗑️  Deleted session: {name}")
+    _save_sessions(sessions)
+    print(f"✅ Applied {len(operations)} command(s)")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -339,27 +527,32 @@ Examples:
   ctx export my-session        Export context to stdout
   ctx export my-session -o context.txt
   ctx delete my-session       Delete session
+  ctx batch ops.json          Apply several commands in one go
         """
     )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # init command
-    subparsers.add_parser("init", help="Initialize ctx directory")
+    init_parser = subparsers.add_parser("init", help="Initialize ctx directory")
+    init_parser.set_defaults(func=lambda args: init())
 
     # create command
     create_parser = subparsers.add_parser("create", help="Create a new session")
     create_parser.add_argument("name", help="Session name")
     create_parser.add_argument("-d", "--description", help="Session description")
     create_parser.add_argument("-t", "--template", help="Use template")
+    create_parser.set_defaults(func=lambda args: create_session(args.name, args.description, args.template))
 
     # list command
     list_parser = subparsers.add_parser("list", help="List sessions")
     list_parser.add_argument("--all", action="store_true", help="Show archived sessions")
+    list_parser.set_defaults(func=lambda args: list_sessions(args.all))
 
     # show command
     show_parser = subparsers.add_parser("show", help="Show session details")
     show_parser.add_argument("name", help="Session name")
+    show_parser.set_defaults(func=lambda args: show_session(args.name))
 
     # update command
     update_parser = subparsers.add_parser("update", help="Update session")
@@ -368,19 +561,24 @@ Examples:
     update_parser.add_argument("--add-tool", help="Add available tool")
     update_parser.add_argument("--add-rule", help="Add rule")
     update_parser.add_argument("-d", "--description", help="Update description")
+    update_parser.set_defaults(func=lambda args: update_session(
+        args.name, args.context, args.add_tool, args.add_rule, args.description))
 
     # archive command
     archive_parser = subparsers.add_parser("archive", help="Archive session")
     archive_parser.add_argument("name", help="Session name")
+    archive_parser.set_defaults(func=lambda args: archive_session(args.name))
 
     # activate command
     activate_parser = subparsers.add_parser("activate", help="Activate session")
     activate_parser.add_argument("name", help="Session name")
+    activate_parser.set_defaults(func=lambda args: activate_session(args.name))
 
     # export command
     export_parser = subparsers.add_parser("export", help="Export session")
     export_parser.add_argument("name", help="Session name")
     export_parser.add_argument("-o", "--output", help="Output file")
+    export_parser.set_defaults(func=lambda args: export_session(args.name, args.output))
 
     # knowledge command
     knowledge_parser = subparsers.add_parser("add-knowledge", help="Add knowledge to session")
@@ -388,10 +586,17 @@ Examples:
     knowledge_parser.add_argument("title", help="Knowledge title")
     knowledge_parser.add_argument("content", help="Knowledge content")
     knowledge_parser.add_argument("-t", "--tags", nargs="*", help="Tags")
+    knowledge_parser.set_defaults(func=lambda args: add_knowledge(args.name, args.title, args.content, args.tags))
 
     # delete command
     delete_parser = subparsers.add_parser("delete", help="Delete session")
     delete_parser.add_argument("name", help="Session name")
+    delete_parser.set_defaults(func=lambda args: delete_session(args.name))
+
+    # batch command
+    batch_parser = subparsers.add_parser("batch", help="Apply a JSON list of commands")
+    batch_parser.add_argument("script", help="Batch script (JSON)")
+    batch_parser.set_defaults(func=lambda args: run_batch(args.script))
 
     args = parser.parse_args()
 
@@ -400,26 +605,7 @@ Examples:
         sys.exit(1)
 
     # Execute command
-    if args.command == "init":
-        init()
-    elif args.command == "create":
-        create_session(args.name, args.description, args.template)
-    elif args.command == "list":
-        list_sessions(args.all)
-    elif args.command == "show":
-        show_session(args.name)
-    elif args.command == "update":
-        update_session(args.name, args.context, args.add_tool, args.add_rule, args.description)
-    elif args.command == "archive":
-        archive_session(args.name)
-    elif args.command == "activate":
-        activate_session(args.name)
-    elif args.command == "export":
-        export_session(args.name, args.output)
-    elif args.command == "add-knowledge":
-        add_knowledge(args.name, args.title, args.content, args.tags)
-    elif args.command == "delete":
-        delete_session(args.name)
+    args.func(args)
 
 if __name__ == "__main__":
     main()
@@ -20,16 +20,31 @@ Options:
 import argparse
 import time
 import logging
+import os
+import re
+import signal
 import subprocess
 import sys
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from pathlib import Path
 
+# /proc/<pid>/cmdline of the dashboard: a node binary run on a server.js
+# script. Arguments are NUL-separated; matching whole arguments keeps shells
+# and editors that merely mention "node server.js" out of the kill list.
+_CMDLINE_RE = re.compile(
+    rb'^(?:[^\x00]*/)?node\x00(?:[^\x00]*\x00)*?(?:[^\x00]*/)?server\.js\x00'
+)
+
 
 class DashboardWatchdog:
     """Monitor and auto-restart squad-dashboard."""
     
+    # Longest wait between checks while restarts keep failing (seconds)
+    MAX_BACKOFF = 3600
+    
     def __init__(self, url: str, interval: int, max_restarts: int, 
                  log_file: str, dry_run: bool = False):
         self.url = url
@@ -39,6 +54,22 @@ class DashboardWatchdog:
         self.dry_run = dry_run
         self.restart_count = 0
         self.last_up_time = datetime.now()
+        self._consecutive_failures = 0
+        self._stop = threading.Event()
+        self._status_url = f"{url}/api/status"
+        
+        # Last check result, reused for a fraction of the interval so extra
+        # callers within one cycle don't probe the dashboard again
+        self.cache_ttl = max(1.0, interval / 4)
+        self._last_check_ts = None
+        self._last_check_result = False
+        
+        # Keep one pooled connection alive between checks instead of
+        # reconnecting every interval
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Setup logging
         logging.basicConfig(
@@ -51,13 +82,21 @@ class DashboardWatchdog:
         )
         self.logger = logging.getLogger('DashboardWatchdog')
     
-    def check_dashboard(self) -> bool:
-        """Check if dashboard is responding."""
+    def check_dashboard(self, use_cache: bool = True) -> bool:
+        """Check if dashboard is responding (cached for cache_ttl seconds)."""
+        if (use_cache and self._last_check_ts is not None
+                and time.monotonic() - self._last_check_ts < self.cache_ttl):
+            return self._last_check_result
+        
+        result = self._probe_dashboard()
+        self._last_check_ts = time.monotonic()
+        self._last_check_result = result
+        return result
+    
+    def _probe_dashboard(self) -> bool:
+        """Query the dashboard status endpoint."""
         try:
-            response = requests.get(
-                f"{self.url}/api/status",
-                timeout=5
-            )
+            response = self.session.get(self._status_url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 self.logger.info(f"Dashboard UP - Agents: {len(data.get('agents', []))}")
@@ -80,6 +119,8 @@ class DashboardWatchdog:
         
         self.restart_count += 1
         self.logger.info(f"Restart attempt #{self.restart_count}")
+        # Whatever was cached describes the dashboard we are replacing
+        self._last_check_ts = None
         
         if self.dry_run:
             self.logger.info("[DRY RUN] Would restart dashboard")
@@ -87,23 +128,24 @@ class DashboardWatchdog:
         
         try:
             # Kill existing node processes on port 8080
-            subprocess.run(
-                ["pkill", "-f", "node.*server.js"],
-                stderr=subprocess.DEVNULL
-            )
-            time.sleep(2)
+            self._kill_dashboard_procs()
             
-            # Start dashboard with nohup
-            subprocess.Popen(
-                [
-                    "nohup", "node", "server.js",
-                    ">", "/tmp/dashboard.log", "2>&1", "&"
-                ],
-                cwd="/home/exedev/.openclaw/workspace/tools/squad-dashboard",
-                env={"PORT": "8080"},
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            # Start dashboard in its own session, detached from our terminal,
+            # with its output appended to /tmp/dashboard.log
+            log_fd = os.open("/tmp/dashboard.log",
+                             os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                subprocess.Popen(
+                    ["node", "server.js"],
+                    cwd="/home/exedev/.openclaw/workspace/tools/squad-dashboard",
+                    env={**os.environ, "PORT": "8080"},
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_fd,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+            finally:
+                os.close(log_fd)
             
             self.logger.info("Dashboard restarted successfully")
             self.last_up_time = datetime.now()
@@ -113,6 +155,64 @@ class DashboardWatchdog:
             self.logger.error(f"Failed to restart dashboard: {e}")
             return False
     
+    def stop(self):
+        """Ask run() to return; it wakes up immediately from any wait."""
+        self._stop.set()
+    
+    def _find_dashboard_procs(self) -> set:
+        """PIDs of running `node server.js` processes."""
+        pids = set()
+        own_pid = str(os.getpid())
+        # scandir never stats the entries, and a raw os.read() of cmdline
+        # skips building a buffered file object per process
+        with os.scandir('/proc') as entries:
+            for entry in entries:
+                if not entry.name.isdigit() or entry.name == own_pid:
+                    continue
+                try:
+                    fd = os.open(f'/proc/{entry.name}/cmdline', os.O_RDONLY)
+                except OSError:
+                    # Exited while we were scanning
+                    continue
+                try:
+                    cmdline = os.read(fd, 4096)
+                except OSError:
+                    continue
+                finally:
+                    os.close(fd)
+                if _CMDLINE_RE.match(cmdline):
+                    pids.add(int(entry.name))
+        return pids
+    
+    def _kill_dashboard_procs(self, timeout: float = 2.0):
+        """SIGTERM the dashboard, then SIGKILL it if still up after timeout."""
+        pids = self._find_dashboard_procs()
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        
+        deadline = time.monotonic() + timeout
+        while pids and time.monotonic() < deadline:
+            time.sleep(0.1)
+            pids &= self._find_dashboard_procs()
+        
+        for pid in pids:
+            self.logger.warning(f"Dashboard process {pid} ignored SIGTERM, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+    
+    def next_check_delay(self) -> float:
+        """Seconds until the next check: interval, doubled for each further
+        check that still found the dashboard down after a restart."""
+        if self._consecutive_failures <= 1:
+            return self.interval
+        backoff = self.interval * 2 ** (self._consecutive_failures - 1)
+        return min(backoff, max(self.interval, self.MAX_BACKOFF))
+    
     def get_uptime(self) -> float:
         """Get uptime in minutes since last successful check."""
         uptime = datetime.now() - self.last_up_time
@@ -125,37 +225,50 @@ class DashboardWatchdog:
         self.logger.info(f"Max restarts: {self.max_restarts}")
         self.logger.info(f"Dry run: {self.dry_run}")
         
+        # Ctrl-C and SIGTERM (systemd, kill) end the current wait right away
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: self.stop())
+        
         try:
             # Initial check
-            if self.check_dashboard():
+            if self.check_dashboard(use_cache=False):
                 self.logger.info("Dashboard is up and running")
             else:
                 self.logger.warning("Dashboard is down on startup")
+                self._consecutive_failures += 1
                 if self.restart_dashboard():
                     # Wait for dashboard to stabilize
-                    time.sleep(10)
+                    self._stop.wait(10)
             
-            # Main monitoring loop
-            while True:
-                time.sleep(self.interval)
-                
+            # Main monitoring loop; wait() returns True once stop() is called
+            while not self._stop.wait(self.next_check_delay()):
                 if not self.check_dashboard():
                     uptime_min = self.get_uptime()
                     self.logger.warning(f"Dashboard down after {uptime_min:.1f} minutes uptime")
+                    self._consecutive_failures += 1
                     
                     if self.restart_dashboard():
+                        if self._consecutive_failures > 1:
+                            self.logger.warning(
+                                f"Dashboard still down after {self._consecutive_failures - 1} "
+                                f"restart(s); next check in {self.next_check_delay():.0f}s")
                         # Wait for dashboard to stabilize
-                        time.sleep(10)
+                        self._stop.wait(10)
                     else:
                         self.logger.error("Failed to restart dashboard. Exiting.")
                         break
                 else:
+                    self._consecutive_failures = 0
                     self.last_up_time = datetime.now()
+            
+            if self._stop.is_set():
+                self.logger.info("Watchdog stopped")
                     
-        except KeyboardInterrupt:
-            self.logger.info("Watchdog stopped by user")
         except Exception as e:
             self.logger.error(f"Watchdog error: {e}")
+        finally:
+            self.session.close()
 
 
 def main():
@@ -17,13 +17,30 @@ import argparse
 import hashlib
 import json
 import os
+import re
 import shutil
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Hashes only need to tell file contents apart, not resist attackers, so the
+# fastest available one is the default. BLAKE3 is several times faster than
+# SHA256 unless the CPU has SHA extensions.
+HASH_ALGORITHMS = {
+    'sha256': hashlib.sha256,
+    'blake2b': hashlib.blake2b,
+}
+try:
+    import blake3
+    HASH_ALGORITHMS['blake3'] = blake3.blake3
+    DEFAULT_HASH = 'blake3'
+except ImportError:
+    DEFAULT_HASH = 'sha256'
 
 
 @dataclass
@@ -42,88 +59,246 @@ class DuplicateGroup:
 class DupeFinder:
     """Find duplicate files by hash."""
 
-    def __init__(self, min_size: int = 0):
+    # Same-size files are first compared on a hash of this many leading bytes
+    HEAD_BYTES = 64 * 1024
+    # Files are hashed in reads of up to this size
+    READ_BYTES = 1024 * 1024
+
+    def __init__(self, min_size: int = 0, algorithm: str = DEFAULT_HASH, use_cache: bool = True):
         self.min_size = min_size
+        self.algorithm = algorithm
         self.cache_dir = Path.home() / '.cache' / 'dupe-finder'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Hashes from earlier runs: {abs path: [mtime_ns, size, {kind: hash}]}
+        self.cache_file = self.cache_dir / 'hashes.json'
+        self.use_cache = use_cache
+        self.hash_cache = self.load_hash_cache() if use_cache else {}
+        self._cache_dirty = False
+        # Cache keys already validated against a fresh stat this run
+        self._cache_checked: Set[str] = set()
+
+    def load_hash_cache(self) -> Dict[str, list]:
+        """Load the on-disk hash cache (empty if missing or unreadable)."""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_hash_cache(self):
+        """Write the hash cache back, dropping entries for files that are gone or changed."""
+        if not self.use_cache:
+            return
+
+        # Entries not seen this run are kept only while the file still stats
+        # the same, so deleted, moved and modified files don't pile up
+        for key, entry in list(self.hash_cache.items()):
+            if not entry[2]:
+                # Stat'ed but never hashed
+                del self.hash_cache[key]
+                self._cache_dirty = True
+                continue
+            if key in self._cache_checked:
+                continue
+            try:
+                st = os.stat(key)
+            except OSError:
+                st = None
+            if st is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                del self.hash_cache[key]
+                self._cache_dirty = True
+
+        if not self._cache_dirty:
+            return
+        tmp = self.cache_file.with_suffix('.tmp')
+        try:
+            tmp.write_text(json.dumps(self.hash_cache))
+            os.replace(tmp, self.cache_file)
+            self._cache_dirty = False
+        except OSError:
+            pass
+
+    def cached_hash(self, filepath: Path, limit: Optional[int] = None) -> Optional[str]:
+        """file_hash() for this finder's algorithm, reusing hashes of unchanged files."""
+        if not self.use_cache:
+            return self.file_hash(filepath, limit, self.algorithm)
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+
+        key = os.path.abspath(filepath)
+        entry = self.hash_cache.get(key)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            entry = [st.st_mtime_ns, st.st_size, {}]
+            self.hash_cache[key] = entry
+        self._cache_checked.add(key)
+
+        kind = f"{self.algorithm}:{limit or 'full'}"
+        file_hash = entry[2].get(kind)
+        if file_hash is None:
+            file_hash = self.file_hash(filepath, limit, self.algorithm)
+            if file_hash:
+                entry[2][kind] = file_hash
+                self._cache_dirty = True
+        return file_hash
+
     @staticmethod
-    def file_hash(filepath: Path) -> str:
-        """Calculate SHA256 hash of file."""
-        hasher = hashlib.sha256()
+    def file_hash(filepath: Path, limit: Optional[int] = None,
+                  algorithm: str = DEFAULT_HASH) -> Optional[str]:
+        """Calculate hash of file (or of its first `limit` bytes)."""
+        hasher = HASH_ALGORITHMS[algorithm]()
+        # Read in large chunks into one reusable buffer: few syscalls, no
+        # per-chunk bytes objects, and unbuffered since reads are big anyway
+        buf = memoryview(bytearray(min(limit or DupeFinder.READ_BYTES, DupeFinder.READ_BYTES)))
+        remaining = limit
         try:
-            with open(filepath, 'rb') as f:
-                # Read in chunks to handle large files
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hasher.update(chunk)
+            with open(filepath, 'rb', buffering=0) as f:
+                while remaining is None or remaining > 0:
+                    n = f.readinto(buf if remaining is None else buf[:remaining])
+                    if not n:
+                        break
+                    hasher.update(buf[:n])
+                    if remaining is not None:
+                        remaining -= n
             return hasher.hexdigest()
         except (OSError, IOError):
             return None
 
+    @staticmethod
+    def group_by_hash(files: List[Tuple[int, Path]],
+                      hashes: Iterable[Optional[str]]) -> Dict[Tuple[int, str], List[Path]]:
+        """Group (size, path) pairs by (size, hash), keeping only groups of 2+ files."""
+        groups = defaultdict(list)
+        for (size, filepath), file_hash in zip(files, hashes):
+            if file_hash:
+                groups[(size, file_hash)].append(filepath)
+        return {key: group for key, group in groups.items() if len(group) >= 2}
+
+    SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
     @staticmethod
     def format_size(bytes_size: int) -> str:
         """Format bytes to human-readable size."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.2f} {unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.2f} TB"
-
-    def scan_directory(self, directory: Path) -> Dict[str, List[Path]]:
-        """Scan directory for files, grouped by hash."""
-        hash_map = defaultdict(list)
+        if bytes_size < 1024:
+            return f"{bytes_size:.2f} B"
+        # Each unit is 10 more bits, so the bit length picks it directly
+        unit = min((int(bytes_size).bit_length() - 1) // 10, len(DupeFinder.SIZE_UNITS) - 1)
+        return f"{bytes_size / (1 << (10 * unit)):.2f} {DupeFinder.SIZE_UNITS[unit]}"
+
+    def scan_directory(self, directory: Path,
+                       on_file: Optional[Callable[[int, Path], None]] = None,
+                       seen_inodes: Optional[Set[Tuple[int, int]]] = None) -> Dict[int, List[Path]]:
+        """Scan directory for files, grouped by size.
+
+        on_file(size, path) is called for each file as soon as it is found.
+        Files whose (st_dev, st_ino) is already in seen_inodes are hard links
+        to a file seen before and are skipped; new ones are added to it.
+        """
+        if seen_inodes is None:
+            seen_inodes = set()
+        size_map = defaultdict(list)
         files_scanned = 0
         bytes_scanned = 0
 
         print(f"  Scanning {directory}...")
 
-        for root, dirs, files in os.walk(directory):
-            # Skip cache and hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
-
-            for filename in files:
-                filepath = Path(root) / filename
-
-                # Skip directories
-                if not filepath.is_file():
-                    continue
-
-                # Check minimum size
-                file_size = filepath.stat().st_size
-                if file_size < self.min_size:
-                    continue
-
-                files_scanned += 1
-                bytes_scanned += file_size
+        # Top-down like os.walk, but using the type and stat information that
+        # scandir's DirEntry already carries instead of re-stat()ing each path.
+        # Symlinks are not followed: a link takes no space worth reclaiming.
+        pending = [os.fspath(directory)]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
 
-                # Calculate hash
-                file_hash = self.file_hash(filepath)
-                if file_hash:
-                    hash_map[file_hash].append(filepath)
+            subdirs = []
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Skip cache and hidden directories
+                            if not entry.name.startswith('.') and entry.name != '__pycache__':
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+                    # Check minimum size
+                    file_size = st.st_size
+                    if file_size < self.min_size:
+                        continue
+
+                    # Hard links share their data; only the first one counts
+                    inode = (st.st_dev, st.st_ino)
+                    if inode in seen_inodes:
+                        continue
+                    seen_inodes.add(inode)
+
+                    files_scanned += 1
+                    bytes_scanned += file_size
+                    filepath = Path(entry.path)
+                    size_map[file_size].append(filepath)
+                    if on_file is not None:
+                        on_file(file_size, filepath)
+
+            # Visit subdirectories in listing order
+            pending.extend(reversed(subdirs))
 
         print(f"  Scanned {files_scanned} files ({self.format_size(bytes_scanned)})")
-        return dict(hash_map)
+        return dict(size_map)
 
     def find_duplicates(self, directories: List[Path]) -> List[DuplicateGroup]:
         """Find all duplicate files across directories."""
-        all_hashes = defaultdict(list)
-
-        # Scan all directories
-        for directory in directories:
-            hash_map = self.scan_directory(directory)
-            for h, files in hash_map.items():
-                all_hashes[h].extend(files)
-
-        # Filter to only duplicates (2+ files with same hash)
-        duplicate_groups = []
-        for h, files in all_hashes.items():
-            if len(files) >= 2:
-                size = files[0].stat().st_size
-                duplicate_groups.append(DuplicateGroup(
-                    hash=h[:16],  # Short hash for display
-                    files=files,
-                    size=size
-                ))
+        # Only files sharing a size can be duplicates. Within a size, compare
+        # a hash of the first HEAD_BYTES, and read whole files only when those
+        # match too (for files no longer than that, the head hash is the hash).
+        full_hash = self.cached_hash
+        head_hash = partial(self.cached_hash, limit=self.HEAD_BYTES)
+        all_sizes = defaultdict(list)
+        seen_inodes = set()
+        candidates = []
+        head_hashes = []
+
+        # Hashing releases the GIL, so threads keep every core (and the disk)
+        # busy, and head hashes are computed while the walk is still going
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            def add_file(size: int, filepath: Path):
+                same_size = all_sizes[size]
+                same_size.append(filepath)
+                if len(same_size) < 2:
+                    return
+                # The second file of a size makes the first one a candidate too
+                new_candidates = same_size if len(same_size) == 2 else [filepath]
+                for candidate in new_candidates:
+                    candidates.append((size, candidate))
+                    head_hashes.append(executor.submit(head_hash, candidate))
+
+            # Scan all directories
+            for directory in directories:
+                self.scan_directory(directory, add_file, seen_inodes)
+
+            matches = self.group_by_hash(candidates, (future.result() for future in head_hashes))
+            long_files = [(size, filepath) for (size, _), files in matches.items()
+                          if size > self.HEAD_BYTES for filepath in files]
+            matches = {key: files for key, files in matches.items() if key[0] <= self.HEAD_BYTES}
+            full_hashes = executor.map(full_hash, [filepath for _, filepath in long_files])
+            matches.update(self.group_by_hash(long_files, full_hashes))
+        self.save_hash_cache()
+
+        duplicate_groups = [
+            DuplicateGroup(
+                hash=h[:16],  # Short hash for display
+                files=files,
+                size=size
+            )
+            for (size, h), files in matches.items()
+        ]
 
         # Sort by savings (largest first)
         duplicate_groups.sort(key=lambda g: g.savings, reverse=True)
@@ -279,34 +454,26 @@ class DupeCleaner:
         return deleted, saved
 
 
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d*)?|\.\d+)\s*([KMGT]?B?)\s*$', re.IGNORECASE)
+_SIZE_MULTIPLIERS = {
+    '': 1, 'B': 1,  # bytes if no suffix
+    'K': 1024, 'KB': 1024,
+    'M': 1024 ** 2, 'MB': 1024 ** 2,
+    'G': 1024 ** 3, 'GB': 1024 ** 3,
+    'T': 1024 ** 4, 'TB': 1024 ** 4,
+}
+
+
 def parse_size(size_str: str) -> int:
-    """Parse size string (1MB, 500KB, etc.) to bytes."""
+    """Parse size string (1MB, 500KB, 500K, etc.) to bytes."""
     if not size_str:
         return 0
 
-    size_str = size_str.upper().strip()
-    multipliers = {
-        'B': 1,
-        'KB': 1024,
-        'MB': 1024 * 1024,
-        'GB': 1024 * 1024 * 1024,
-        'TB': 1024 * 1024 * 1024 * 1024
-    }
-
-    for suffix in sorted(multipliers.keys(), key=len, reverse=True):
-        if size_str.endswith(suffix):
-            num_str = size_str[:-len(suffix)].strip()
-            try:
-                num = float(num_str)
-                return int(num * multipliers[suffix])
-            except ValueError:
-                continue
-
-    # Assume bytes if no suffix
-    try:
-        return int(float(size_str))
-    except ValueError:
+    match = _SIZE_RE.match(size_str)
+    if not match:
         raise ValueError(f"Invalid size format: {size_str}")
+    number, suffix = match.groups()
+    return int(float(number) * _SIZE_MULTIPLIERS[suffix.upper()])
 
 
 def main():
@@ -343,6 +510,19 @@ Examples:
         help='Minimum file size to consider (default: 0B, examples: 1KB, 1MB, 100KB)'
     )
 
+    parser.add_argument(
+        '--hash',
+        choices=sorted(HASH_ALGORITHMS),
+        default=DEFAULT_HASH,
+        help=f'Hash algorithm (default: {DEFAULT_HASH}; blake3 needs `pip install blake3`)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Hash every candidate file again instead of reusing hashes of unchanged files'
+    )
+
     parser.add_argument(
         '--json',
         action='store_true',
@@ -393,7 +573,7 @@ Examples:
         return 1
 
     # Scan for duplicates
-    finder = DupeFinder(min_size=min_size)
+    finder = DupeFinder(min_size=min_size, algorithm=args.hash, use_cache=not args.no_cache)
     print(f"📡 Scanning {len(dirs)} director(ies)...")
     print(f"   Minimum size: {DupeFinder.format_size(min_size)}")
     print("")
@@ -6,13 +6,70 @@ Manage .env files, switch between environments, and securely handle secrets.
 """
 
 import os
+import re
 import sys
 import json
-import argparse
-import shutil
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+
+try:
+    # orjson is optional; it makes the per-command registry load cheaper
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Files whose presence marks a directory as a project root
+PROJECT_MARKERS = frozenset({'.env', 'package.json', '.git'})
+
+# Variable names containing any of these words have their values masked
+_SECRET_RE = re.compile(r'secret|key|password', re.IGNORECASE)
+
+
+def _is_secret(key: str) -> bool:
+    """Whether a variable's value should be masked."""
+    return _SECRET_RE.search(key) is not None
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Replace a file's contents in one write and an atomic rename, keeping its permissions."""
+    # Write through symlinks (e.g. .env -> .env.dev) rather than replacing them
+    path = Path(os.path.realpath(path))
+
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    # The temp file starts owner-only so secrets are never briefly exposed
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            os.fchmod(fd, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a stray copy of the contents (possibly secrets) behind
+        os.unlink(tmp_path)
+        raise
 
 
 class EnvManager:
@@ -23,39 +80,77 @@ class EnvManager:
         self.environments_file = self.config_dir / 'environments.json'
         self.current_env_file = self.config_dir / 'current'
 
+        # Parsed .env files keyed by (path, mtime_ns, size)
+        self._parse_cache: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+        # environments.json contents, loaded on first use
+        self._envs_cache: Optional[Dict] = None
+        # Project root, resolved on first use (cwd is fixed for a single run)
+        self._project_root: Optional[Path] = None
+
+        # Optional watchdog observer (see enable_watch); while it runs, parses
+        # are cached by path alone and dropped when the file changes on disk
+        self._observer = None
+        self._watch_handler = None
+        self._watched_dirs = set()
+        # Absolute path -> (resolved path, parsed vars); shared with the observer
+        # thread, so only touched under _watch_lock
+        self._watched_cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._watch_events = 0
+        self._watch_lock = None
+
         self._ensure_config()
 
     def _ensure_config(self):
         """Ensure config directory exists."""
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-
-        if not self.environments_file.exists():
-            with open(self.environments_file, 'w') as f:
-                json.dump({}, f)
-
-        if not self.current_env_file.exists():
-            self.current_env_file.touch()
+        # EAFP: once set up, this is two failed exclusive opens and no stats
+        for path, initial in ((self.environments_file, _dumps({})), (self.current_env_file, b'')):
+            try:
+                with open(path, 'xb') as f:
+                    f.write(initial)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                # First run: create the directory, then retry
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+                with open(path, 'xb') as f:
+                    f.write(initial)
 
     def _read_environments(self) -> Dict:
-        """Read environments configuration."""
-        try:
-            with open(self.environments_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        """Read environments configuration (loaded once per instance).
+
+        Callers that modify the returned dict must save it with
+        _write_environments.
+        """
+        if self._envs_cache is None:
+            try:
+                self._envs_cache = _loads(self.environments_file.read_bytes())
+            except (json.JSONDecodeError, FileNotFoundError):
+                self._envs_cache = {}
+        return self._envs_cache
 
     def _write_environments(self, envs: Dict):
         """Write environments configuration."""
-        with open(self.environments_file, 'w') as f:
-            json.dump(envs, f, indent=2)
+        _atomic_write(self.environments_file, _dumps(envs))
+        self._envs_cache = envs
 
     def _get_current_env(self) -> Optional[str]:
         """Get currently active environment."""
-        if self.current_env_file.exists():
-            with open(self.current_env_file, 'r') as f:
-                content = f.read().strip()
-                return content if content else None
-        return None
+        # The file holds a single short name, so skip the buffered I/O stack
+        try:
+            fd = os.open(self.current_env_file, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            data = chunk = os.read(fd, 256)
+            # Longer names are unusual but still read in full
+            while len(chunk) == 256:
+                chunk = os.read(fd, 256)
+                data += chunk
+        finally:
+            os.close(fd)
+
+        content = data.decode('utf-8').strip()
+        return content if content else None
 
     def _set_current_env(self, env_name: str):
         """Set currently active environment."""
@@ -63,42 +158,193 @@ class EnvManager:
             f.write(env_name)
 
     def _parse_env_file(self, path: Path) -> Dict[str, str]:
-        """Parse .env file."""
-        env_vars = {}
-
-        if not path.exists():
-            return env_vars
+        """Parse .env file (cached until the file's mtime or size changes)."""
+        path_str = str(path)
+        watching = self._observer is not None
+        if watching:
+            # Event paths are absolute, so key on the absolute path; a symlinked
+            # file changes at its target, so watch and match that too
+            watch_key = os.path.abspath(path_str)
+            real_path = os.path.realpath(path_str)
+            with self._watch_lock:
+                # A watched file needs no stat: the observer evicts it on change
+                cached = self._watched_cache.get(watch_key)
+                events_seen = self._watch_events
+            if cached is not None:
+                return cached[1].copy()
+            # Watch before reading so a change made mid-parse isn't missed
+            watching = (self._watch_dir(os.path.dirname(watch_key))
+                        and self._watch_dir(os.path.dirname(real_path)))
 
-        with open(path, 'r') as f:
-            for line in f:
-                line = line.strip()
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return {}
 
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
+        cache_key = (path_str, st.st_mtime_ns, st.st_size)
+        env_vars = self._parse_cache.get(cache_key)
+        if env_vars is None:
+            lines = [line.strip() for line in path.read_text(encoding='utf-8', errors='replace').splitlines()]
 
-                # Parse KEY=VALUE
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
+            # Parse KEY=VALUE, skipping empty lines and comments
+            pairs = (line.split('=', 1) for line in lines if line and not line.startswith('#') and '=' in line)
+            env_vars = {key.strip(): value.strip() for key, value in pairs}
+            self._parse_cache[cache_key] = env_vars
 
-        return env_vars
+        if watching:
+            with self._watch_lock:
+                if self._watch_events == events_seen:
+                    self._watched_cache[watch_key] = (real_path, env_vars)
+        return env_vars.copy()
 
     def _write_env_file(self, path: Path, env_vars: Dict[str, str]):
         """Write .env file."""
-        with open(path, 'w') as f:
-            for key, value in env_vars.items():
-                f.write(f"{key}={value}\n")
+        self._invalidate_parse_cache(path)
+
+        _atomic_write(path, ''.join(f"{key}={value}\n" for key, value in env_vars.items()).encode('utf-8'))
+
+    def _edit_env_file(self, path: Path, key: str, value: Optional[str]) -> bool:
+        """Set (or, with value None, remove) one variable in a .env file.
+
+        Edits the matching KEY=VALUE lines in place, so comments, blank lines
+        and the order of other variables are preserved. Returns whether the
+        key was already present.
+        """
+        try:
+            text = path.read_text(encoding='utf-8', errors='surrogateescape')
+        except FileNotFoundError:
+            text = ''
+
+        lines = []
+        found = False
+        for line in text.splitlines():
+            stripped = line.strip()
+            if (stripped and not stripped.startswith('#') and '=' in stripped
+                    and stripped.split('=', 1)[0].strip() == key):
+                # Replace the first occurrence, drop any later duplicates
+                if value is not None and not found:
+                    lines.append(f"{key}={value}")
+                found = True
+                continue
+            lines.append(line)
+
+        if value is not None and not found:
+            lines.append(f"{key}={value}")
+        elif value is None and not found:
+            return False
+
+        self._invalidate_parse_cache(path)
+        _atomic_write(path, ''.join(f"{line}\n" for line in lines).encode('utf-8', errors='surrogateescape'))
+        return True
+
+    def _invalidate_parse_cache(self, path: Path):
+        """Drop cached parses of a .env file."""
+        path_str = str(path)
+        for cache_key in [k for k in self._parse_cache if k[0] == path_str]:
+            del self._parse_cache[cache_key]
+        if self._watch_lock is not None:
+            with self._watch_lock:
+                self._watched_cache.pop(os.path.abspath(path_str), None)
+
+    def enable_watch(self) -> bool:
+        """Watch parsed .env files for changes instead of stat-ing them on every parse.
+
+        Meant for long-running callers (daemons, REPLs) that query the same
+        files repeatedly. Requires the optional watchdog package; returns
+        False, leaving the stat-based cache in charge, when it is missing.
+        """
+        if self._observer is not None:
+            return True
+
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        import threading
+
+        manager = self
+
+        class _EnvFileHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Atomic writes arrive as a move onto the .env path
+                event_paths = (event.src_path, getattr(event, 'dest_path', ''))
+                changed = {os.path.abspath(os.fsdecode(p)) for p in event_paths if p}
+                with manager._watch_lock:
+                    manager._watch_events += 1
+                    stale = [key for key, (real_path, _) in manager._watched_cache.items()
+                             if key in changed or real_path in changed]
+                    for key in stale:
+                        del manager._watched_cache[key]
+
+        if self._watch_lock is None:
+            self._watch_lock = threading.Lock()
+        self._watch_handler = _EnvFileHandler()
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.start()
+        return True
+
+    def disable_watch(self):
+        """Stop the watcher started by enable_watch()."""
+        if self._observer is None:
+            return
+
+        self._observer.stop()
+        self._observer.join()
+        self._observer = None
+        self._watch_handler = None
+        self._watched_dirs.clear()
+        with self._watch_lock:
+            self._watched_cache.clear()
+
+    def _watch_dir(self, dir_str: str) -> bool:
+        """Make sure the observer covers a directory; False if it can't."""
+        if dir_str not in self._watched_dirs:
+            try:
+                self._observer.schedule(self._watch_handler, dir_str, recursive=False)
+            except OSError:
+                return False
+            self._watched_dirs.add(dir_str)
+        return True
 
     def _get_project_root(self) -> Optional[Path]:
         """Find project root (has .env or package.json)."""
+        if self._project_root is not None:
+            return self._project_root
+
         cwd = Path.cwd()
+        self._project_root = cwd  # Fallback to current directory
+
+        for path in [cwd, *cwd.parents]:
+            # One directory listing per ancestor instead of a stat per marker
+            try:
+                with os.scandir(path) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                continue
 
-        for path in [cwd] + list(cwd.parents):
-            if (path / '.env').exists() or (path / 'package.json').exists() or (path / '.git').exists():
-                return path
+            if not names.isdisjoint(PROJECT_MARKERS):
+                self._project_root = path
+                break
 
-        return cwd  # Fallback to current directory
+        return self._project_root
+
+    def _resolve_env_path(self, env_name: Optional[str]) -> Optional[Path]:
+        """Path of a named environment's .env file, or the project's .env.
+
+        Reports and returns None when the named environment doesn't exist.
+        """
+        if not env_name:
+            # Use current directory .env
+            return self._get_project_root() / '.env'
+
+        config = self._read_environments().get(env_name)
+        if config is None:
+            print(f"❌ Environment '{env_name}' not found")
+            return None
+        return Path(config['path'])
 
     def list(self, show_values: bool = False):
         """List all environments."""
@@ -110,27 +356,29 @@ class EnvManager:
             print("   Add one with: env add <name> <path>")
             return
 
-        print("📝 Environments:")
-        print()
+        lines = ["📝 Environments:", ""]
 
-        for name, config in sorted(envs.items()):
+        for name in sorted(envs):
+            config = envs[name]
             prefix = "→ " if name == current else "  "
             path = config.get('path', 'Unknown')
             active_status = " (active)" if name == current else ""
 
             if show_values and name == current:
                 env_vars = self._parse_env_file(Path(path))
-                print(f"{prefix}{name}{active_status}")
-                print(f"    Path: {path}")
-                print(f"    Variables: {len(env_vars)}")
-                for key, value in sorted(env_vars.items()):
+                lines.append(f"{prefix}{name}{active_status}")
+                lines.append(f"    Path: {path}")
+                lines.append(f"    Variables: {len(env_vars)}")
+                for key in sorted(env_vars):
                     # Mask secret values
-                    if 'secret' in key.lower() or 'key' in key.lower() or 'password' in key.lower():
-                        value = '***'
-                    print(f"      {key}={value}")
-                print()
+                    value = '***' if _is_secret(key) else env_vars[key]
+                    lines.append(f"      {key}={value}")
+                lines.append("")
             else:
-                print(f"{prefix}{name} — {path}{active_status}")
+                lines.append(f"{prefix}{name} — {path}{active_status}")
+
+        # Emit the listing in one write
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def add(self, name: str, path: str = None, description: str = ''):
         """Add a new environment."""
@@ -145,7 +393,7 @@ class EnvManager:
             project_root = self._get_project_root()
             path = str(project_root / '.env')
 
-        path_obj = Path(path).expanduser().absolute()
+        path_obj = Path(os.path.abspath(os.path.expanduser(path)))
 
         # Check if .env exists
         if not path_obj.exists():
@@ -155,7 +403,7 @@ class EnvManager:
         envs[name] = {
             'path': str(path_obj),
             'description': description,
-            'created': datetime.now().isoformat()
+            'created': time.time()
         }
 
         self._write_environments(envs)
@@ -196,6 +444,8 @@ class EnvManager:
 
     def switch(self, name: str):
         """Switch active environment."""
+        import shutil
+
         envs = self._read_environments()
 
         if name not in envs:
@@ -211,6 +461,7 @@ class EnvManager:
                 current_path = Path(current_config['path'])
                 if current_path.exists():
                     backup_path = current_path.with_suffix('.env.backup')
+                    # copy2 keeps the original's mtime and mode on the backup
                     shutil.copy2(current_path, backup_path)
 
         # Copy new environment to .env
@@ -225,7 +476,12 @@ class EnvManager:
         project_root = self._get_project_root()
         target_env = project_root / '.env'
 
-        shutil.copy2(new_path, target_env)
+        # Contents only; an existing .env keeps its own permissions, a new one
+        # takes the source's so secrets aren't exposed by the default umask
+        target_exists = target_env.exists()
+        shutil.copyfile(new_path, target_env)
+        if not target_exists:
+            shutil.copymode(new_path, target_env)
 
         self._set_current_env(name)
 
@@ -236,30 +492,12 @@ class EnvManager:
 
     def set(self, key: str, value: str, env_name: str = None):
         """Set environment variable."""
-        envs = self._read_environments()
-
-        # Determine target environment
-        if env_name:
-            if env_name not in envs:
-                print(f"❌ Environment '{env_name}' not found")
-                return False
-            path = Path(envs[env_name]['path'])
-        else:
-            # Use current directory .env
-            project_root = self._get_project_root()
-            path = project_root / '.env'
-
-        if not path.exists():
-            path.touch()
-
-        # Parse existing variables
-        env_vars = self._parse_env_file(path)
-
-        # Set new value
-        env_vars[key] = value
+        path = self._resolve_env_path(env_name)
+        if path is None:
+            return False
 
-        # Write back
-        self._write_env_file(path, env_vars)
+        # Update the variable in place (creating the file if needed)
+        self._edit_env_file(path, key, value)
 
         print(f"✅ Set: {key}={value}")
         print(f"   File: {path}")
@@ -267,18 +505,9 @@ class EnvManager:
 
     def get(self, key: str, env_name: str = None):
         """Get environment variable."""
-        envs = self._read_environments()
-
-        # Determine target environment
-        if env_name:
-            if env_name not in envs:
-                print(f"❌ Environment '{env_name}' not found")
-                return False
-            path = Path(envs[env_name]['path'])
-        else:
-            # Use current directory .env
-            project_root = self._get_project_root()
-            path = project_root / '.env'
+        path = self._resolve_env_path(env_name)
+        if path is None:
+            return False
 
         if not path.exists():
             print(f"❌ .env file not found: {path}")
@@ -290,65 +519,39 @@ class EnvManager:
         if key in env_vars:
             value = env_vars[key]
             # Mask secret values
-            if 'secret' in key.lower() or 'key' in key.lower() or 'password' in key.lower():
+            if _is_secret(key):
                 value = '***'
             print(f"{key}={value}")
             return True
         else:
             print(f"❌ Variable '{key}' not found")
-            print(f"   Available: {', '.join(sorted(env_vars.keys()))}")
+            print(f"   Available: {', '.join(sorted(env_vars))}")
             return False
 
     def unset(self, key: str, env_name: str = None):
         """Unset environment variable."""
-        envs = self._read_environments()
-
-        # Determine target environment
-        if env_name:
-            if env_name not in envs:
-                print(f"❌ Environment '{env_name}' not found")
-                return False
-            path = Path(envs[env_name]['path'])
-        else:
-            # Use current directory .env
-            project_root = self._get_project_root()
-            path = project_root / '.env'
+        path = self._resolve_env_path(env_name)
+        if path is None:
+            return False
 
         if not path.exists():
             print(f"❌ .env file not found: {path}")
             return False
 
-        # Parse variables
-        env_vars = self._parse_env_file(path)
-
-        if key not in env_vars:
+        # Drop the variable's line(s), leaving the rest of the file as is
+        if not self._edit_env_file(path, key, None):
             print(f"❌ Variable '{key}' not found")
             return False
 
-        del env_vars[key]
-
-        # Write back
-        self._write_env_file(path, env_vars)
-
         print(f"✅ Unset: {key}")
         return True
 
     def show(self, env_name: str = None, mask_secrets: bool = True):
         """Show all environment variables."""
-        envs = self._read_environments()
-
-        # Determine target environment
-        if env_name:
-            if env_name not in envs:
-                print(f"❌ Environment '{env_name}' not found")
-                return False
-            path = Path(envs[env_name]['path'])
-            name = env_name
-        else:
-            # Use current directory .env
-            project_root = self._get_project_root()
-            path = project_root / '.env'
-            name = "current"
+        path = self._resolve_env_path(env_name)
+        if path is None:
+            return False
+        name = env_name or "current"
 
         if not path.exists():
             print(f"❌ .env file not found: {path}")
@@ -357,16 +560,15 @@ class EnvManager:
         # Parse variables
         env_vars = self._parse_env_file(path)
 
-        print(f"📝 Environment: {name}")
-        print(f"   Path: {path}")
-        print()
+        lines = [f"📝 Environment: {name}", f"   Path: {path}", ""]
 
-        for key, value in sorted(env_vars.items()):
+        for key in sorted(env_vars):
             # Mask secret values
-            display_value = value
-            if mask_secrets and ('secret' in key.lower() or 'key' in key.lower() or 'password' in key.lower()):
-                display_value = '***'
-            print(f"  {key}={display_value}")
+            display_value = '***' if mask_secrets and _is_secret(key) else env_vars[key]
+            lines.append(f"  {key}={display_value}")
+
+        # Emit the listing in one write
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def export(self, env_name: str, output: str):
         """Export environment to shell format."""
@@ -386,39 +588,35 @@ class EnvManager:
         env_vars = self._parse_env_file(path)
 
         # Write shell format
-        output_path = Path(output).expanduser()
-        with open(output_path, 'w') as f:
-            for key, value in sorted(env_vars.items()):
-                f.write(f"export {key}='{value}'\n")
+        output_path = Path(os.path.abspath(os.path.expanduser(output)))
+        buf = bytearray()
+        for key in sorted(env_vars):
+            buf += f"export {key}='{env_vars[key]}'\n".encode('utf-8')
+        output_path.write_bytes(buf)
 
-        print(f"✅ Exported {len(env_vars)} variable(s) to: {output_path}")
+        print(f"✅ Exported {len(env_vars)} variable(s) to: {os.path.expanduser(output)}")
         return True
 
     def import_env(self, input_path: str, env_name: str = None):
         """Import environment from file."""
-        input_file = Path(input_path).expanduser()
+        display_path = os.path.expanduser(input_path)
+        input_file = Path(os.path.abspath(display_path))
 
         if not input_file.exists():
-            print(f"❌ File not found: {input_file}")
+            print(f"❌ File not found: {display_path}")
             return False
 
         # Parse input file
         env_vars = self._parse_env_file(input_file)
 
         if not env_vars:
-            print(f"❌ No variables found in: {input_file}")
+            print(f"❌ No variables found in: {display_path}")
             return False
 
         # Determine target
-        if env_name:
-            envs = self._read_environments()
-            if env_name not in envs:
-                print(f"❌ Environment '{env_name}' not found")
-                return False
-            path = Path(envs[env_name]['path'])
-        else:
-            project_root = self._get_project_root()
-            path = project_root / '.env'
+        path = self._resolve_env_path(env_name)
+        if path is None:
+            return False
 
         # Write to target
         self._write_env_file(path, env_vars)
@@ -427,7 +625,57 @@ class EnvManager:
         return True
 
 
-def main():
+_ENV_OPTION = (('-e', '--env'), {'help': 'Target environment (default: current .env)'})
+
+# Subcommands: name -> (help, [(flags, add_argument kwargs), ...])
+COMMANDS = {
+    'list': ('List environments', [
+        (('-v', '--values'), {'action': 'store_true', 'help': 'Show variable values'}),
+    ]),
+    'add': ('Add environment', [
+        (('name',), {'help': 'Environment name'}),
+        (('path',), {'nargs': '?', 'help': 'Path to .env file (default: ./.env)'}),
+        (('-d', '--description'), {'default': '', 'help': 'Description'}),
+    ]),
+    'remove': ('Remove environment', [
+        (('name',), {'help': 'Environment name'}),
+        (('--keep-file',), {'action': 'store_true', 'help': 'Keep .env file'}),
+    ]),
+    'switch': ('Switch environment', [
+        (('name',), {'help': 'Environment name'}),
+    ]),
+    'set': ('Set variable', [
+        (('key',), {'help': 'Variable name'}),
+        (('value',), {'help': 'Variable value'}),
+        _ENV_OPTION,
+    ]),
+    'get': ('Get variable', [
+        (('key',), {'help': 'Variable name'}),
+        _ENV_OPTION,
+    ]),
+    'unset': ('Unset variable', [
+        (('key',), {'help': 'Variable name'}),
+        _ENV_OPTION,
+    ]),
+    'show': ('Show variables', [
+        _ENV_OPTION,
+        (('--no-mask',), {'action': 'store_true', 'help': 'Don\'t mask secret values'}),
+    ]),
+    'export': ('Export to shell format', [
+        (('name',), {'help': 'Environment name'}),
+        (('output',), {'help': 'Output file path'}),
+    ]),
+    'import': ('Import from file', [
+        (('input',), {'help': 'Input file path'}),
+        _ENV_OPTION,
+    ]),
+}
+
+
+def _build_parser():
+    """Build the full parser, with every subcommand and the help text."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='env — Environment Variable Manager',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -445,61 +693,55 @@ Examples:
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
-    # List
-    list_parser = subparsers.add_parser('list', help='List environments')
-    list_parser.add_argument('-v', '--values', action='store_true', help='Show variable values')
-
-    # Add
-    add_parser = subparsers.add_parser('add', help='Add environment')
-    add_parser.add_argument('name', help='Environment name')
-    add_parser.add_argument('path', nargs='?', help='Path to .env file (default: ./.env)')
-    add_parser.add_argument('-d', '--description', default='', help='Description')
-
-    # Remove
-    remove_parser = subparsers.add_parser('remove', help='Remove environment')
-    remove_parser.add_argument('name', help='Environment name')
-    remove_parser.add_argument('--keep-file', action='store_true', help='Keep .env file')
-
-    # Switch
-    switch_parser = subparsers.add_parser('switch', help='Switch environment')
-    switch_parser.add_argument('name', help='Environment name')
-
-    # Set
-    set_parser = subparsers.add_parser('set', help='Set variable')
-    set_parser.add_argument('key', help='Variable name')
-    set_parser.add_argument('value', help='Variable value')
-    set_parser.add_argument('-e', '--env', help='Target environment (default: current .env)')
-
-    # Get
-    get_parser = subparsers.add_parser('get', help='Get variable')
-    get_parser.add_argument('key', help='Variable name')
-    get_parser.add_argument('-e', '--env', help='Target environment (default: current .env)')
-
-    # Unset
-    unset_parser = subparsers.add_parser('unset', help='Unset variable')
-    unset_parser.add_argument('key', help='Variable name')
-    unset_parser.add_argument('-e', '--env', help='Target environment (default: current .env)')
-
-    # Show
-    show_parser = subparsers.add_parser('show', help='Show variables')
-    show_parser.add_argument('-e', '--env', help='Target environment (default: current .env)')
-    show_parser.add_argument('--no-mask', action='store_true', help='Don\'t mask secret values')
-
-    # Export
-    export_parser = subparsers.add_parser('export', help='Export to shell format')
-    export_parser.add_argument('name', help='Environment name')
-    export_parser.add_argument('output', help='Output file path')
-
-    # Import
-    import_parser = subparsers.add_parser('import', help='Import from file')
-    import_parser.add_argument('input', help='Input file path')
-    import_parser.add_argument('-e', '--env', help='Target environment (default: current .env)')
-
-    args = parser.parse_args()
-
-    if not args.command:
-        parser.print_help()
-        return 0
+    for command, (command_help, arguments) in COMMANDS.items():
+        command_parser = subparsers.add_parser(command, help=command_help)
+        for flags, kwargs in arguments:
+            command_parser.add_argument(*flags, **kwargs)
+
+    return parser
+
+
+def _parse_fast(argv):
+    """Parse a plain `env <command> ...` call with only that command's arguments.
+
+    Returns None (leaving it to the full parser) for help requests, unknown
+    commands and anything that doesn't parse, so usage and error messages
+    are always the full parser's.
+    """
+    if not argv or argv[0] not in COMMANDS or '-h' in argv or '--help' in argv:
+        return None
+
+    import argparse
+
+    class _FastPathMiss(Exception):
+        pass
+
+    class _FastParser(argparse.ArgumentParser):
+        def error(self, message):
+            raise _FastPathMiss
+
+    parser = _FastParser(add_help=False)
+    for flags, kwargs in COMMANDS[argv[0]][1]:
+        parser.add_argument(*flags, **kwargs)
+
+    try:
+        args = parser.parse_args(argv[1:])
+    except _FastPathMiss:
+        return None
+
+    args.command = argv[0]
+    return args
+
+
+def main():
+    args = _parse_fast(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+
+        if not args.command:
+            parser.print_help()
+            return 0
 
     manager = EnvManager()
 